@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# Crib dragging against a reused one-time pad (many-time pad)
+#
+# If two messages share a pad, c1 ^ c2 = p1 ^ p2, so guessing part of p1 (a crib)
+# at the right offset reveals the matching part of p2. All pairwise XORs are
+# computed once; each crib is then slid over every offset with array operations.
+
+import argparse
+from collections import namedtuple
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from tabulate import tabulate
+from ex1 import get_english_frequency
+from fastxor import xor_bytes
+
+CribHit = namedtuple('CribHit', ['score', 'index', 'offset'])
+
+# Upper bound on the bytes materialised per block of rows while dragging
+BLOCK_BYTES = 1 << 26
+
+
+def printable_scores():
+    """
+    Per-byte log10 likelihood of English text: letters by frequency, space most
+    likely, other printable characters rare and control/binary bytes near impossible.
+    """
+    scores = np.full(256, -10.0, dtype=np.float32)
+    scores[32:127] = np.log10(0.001)
+    for c in b'0123456789.,;:!?\'"-()':
+        scores[c] = np.log10(0.005)
+    scores[[ord('\n'), ord('\r'), ord('\t')]] = np.log10(0.01)
+    scores[ord(' ')] = np.log10(0.18)
+    for letter, percent in get_english_frequency().items():
+        scores[ord(letter)] = np.log10(percent / 100 * 0.15)
+        scores[ord(letter.lower())] = np.log10(percent / 100 * 0.65)
+    return scores
+
+
+class CribDragger:
+    def __init__(self, ciphertexts, scores=None):
+        self.ciphertexts = [bytes(c) for c in ciphertexts]
+        self.lengths = np.array([len(c) for c in self.ciphertexts])
+        n, width = len(self.ciphertexts), int(self.lengths.max(initial=0))
+        matrix = np.zeros((n, width), dtype=np.uint8)
+        for i, c in enumerate(self.ciphertexts):
+            matrix[i, :len(c)] = np.frombuffer(c, dtype=np.uint8)
+        # pairs[i, j] = c_i ^ c_j, valid up to the shorter of the two lengths
+        self.pairs = matrix[:, None, :] ^ matrix[None, :, :]
+        self.overlap = np.minimum(self.lengths[:, None], self.lengths[None, :])
+        self.scores = printable_scores() if scores is None else scores
+
+    def drag(self, crib, top=10):
+        """
+        Assume ``crib`` sits in ciphertext i at offset o, for every (i, o).
+        Each placement is scored by the mean per-byte likelihood of the fragments
+        it reveals in all other ciphertexts; returns the ``top`` best CribHits.
+        """
+        crib = np.frombuffer(crib, dtype=np.uint8)
+        n, width = self.pairs.shape[1], self.pairs.shape[2]
+        m = len(crib)
+        if m == 0 or m > width:
+            return []
+        offsets = np.arange(width - m + 1)
+        totals = np.full((n, len(offsets)), -np.inf)
+
+        rows_per_block = max(1, BLOCK_BYTES // (n * len(offsets) * m * 4))
+        for start in range(0, n, rows_per_block):
+            rows = slice(start, min(n, start + rows_per_block))
+            # (rows, n, offsets, m) view of every crib-sized window, XOR-ed with the crib
+            windows = sliding_window_view(self.pairs[rows], m, axis=2) ^ crib
+            fragment_scores = self.scores[windows].sum(axis=3) / m
+            # A placement is usable against j if the crib fits inside both messages
+            valid = offsets + m <= self.overlap[rows, :, None]
+            others = np.arange(n)[None, :] != np.arange(rows.start, rows.stop)[:, None]
+            valid &= others[:, :, None]
+            count = valid.sum(axis=1)
+            total = np.where(valid, fragment_scores, 0).sum(axis=1)
+            totals[rows] = np.where(count > 0, total / np.maximum(count, 1), -np.inf)
+
+        flat = totals.ravel()
+        top = min(top, int(np.isfinite(flat).sum()))
+        if top == 0:
+            return []
+        best = np.argpartition(-flat, top - 1)[:top]
+        best = best[np.argsort(-flat[best])]
+        return [CribHit(float(flat[k]), int(k // len(offsets)), int(k % len(offsets))) for k in best]
+
+    def fragments(self, hit, crib):
+        """Plaintext fragments the crib reveals in every other ciphertext."""
+        end = hit.offset + len(crib)
+        return {j: xor_bytes(self.pairs[hit.index, j, hit.offset:end].tobytes(), crib)
+                for j in range(len(self.ciphertexts))
+                if j != hit.index and end <= self.overlap[hit.index, j]}
+
+    def key_fragment(self, hit, crib):
+        """The pad bytes implied by the crib at this placement."""
+        return xor_bytes(self.ciphertexts[hit.index][hit.offset:hit.offset + len(crib)], crib)
+
+
+def load_ciphertexts(filename):
+    """One hex-encoded ciphertext per line."""
+    with open(filename, 'r') as file:
+        return [bytes.fromhex(line.strip()) for line in file if line.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Crib dragging against ciphertexts sharing one OTP')
+    parser.add_argument('-i', '--input', required=True, help='File with one hex ciphertext per line')
+    parser.add_argument('-c', '--crib', required=True, help='Guessed plaintext fragment')
+    parser.add_argument('-n', '--top', type=int, default=10, help='Number of placements to show')
+    args = parser.parse_args()
+
+    dragger = CribDragger(load_ciphertexts(args.input))
+    crib = args.crib.encode()
+    table_data = []
+    for hit in dragger.drag(crib, args.top):
+        sample = list(dragger.fragments(hit, crib).values())[:3]
+        table_data.append([hit.index, hit.offset, f"{hit.score:.3f}",
+                           dragger.key_fragment(hit, crib).hex(),
+                           ' | '.join(repr(f)[2:-1] for f in sample)])
+
+    print(tabulate(
+        table_data,
+        headers=['Ciphertext', 'Offset', 'Score', 'Key fragment', 'Revealed fragments'],
+        tablefmt='grid'
+    ))
+
+
+if __name__ == "__main__":
+    main()
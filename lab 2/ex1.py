@@ -1,17 +1,20 @@
 import argparse
+import os
 import string
+import time
 from collections import Counter
 import re
-import nltk
-from nltk.corpus import words
 import itertools
 from tabulate import tabulate
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from quadgrams import encode_text, load_quadgrams, score_codes
+from lexicon import load_lexicon
 
-# Download the word list if not already downloaded
-try:
-    nltk.data.find('corpora/words')
-except LookupError:
-    nltk.download('words')
+def read_text(filename):
+    """The file's content in uppercase; errors propagate to the caller."""
+    with open(filename, 'r', encoding='utf-8') as file:
+        return file.read().upper()
 
 def load_text(filename):
     """
@@ -19,8 +22,7 @@ def load_text(filename):
     Returns the content in uppercase for analysis.
     """
     try:
-        with open(filename, 'r', encoding='utf-8') as file:
-            return file.read().upper()
+        return read_text(filename)
     except FileNotFoundError:
         print(f"Error: File '{filename}' not found.")
         exit(1)
@@ -43,7 +45,11 @@ def get_english_frequency():
     }
 
 def get_english_words():
-    return set(word.upper() for word in words.words())
+    """
+    Memory-mapped upper-case lexicon, built once from nltk by lexicon.py.
+    Supports ``in``; call ``as_set()`` when scoring many candidates.
+    """
+    return load_lexicon()
 
 def create_initial_mapping(text_freq, english_freq): # Sort both frequency distributions
     text_letters = sorted(text_freq.items(), key=lambda x: x[1], reverse=True)
@@ -94,6 +100,156 @@ def find_best_mapping(text, initial_mapping, english_words, max_iterations=100):
             break
     return best_mapping, best_score
 
+def mapping_to_key(mapping):
+    """
+    Turn a partial cipher->plain letter mapping into a full permutation array,
+    so key[cipher_code] gives the plain letter code.
+    """
+    key = np.full(26, -1, dtype=np.intp)
+    for encrypted, decrypted in mapping.items():
+        key[ord(encrypted) - ord('A')] = ord(decrypted) - ord('A')
+    unused = [p for p in range(26) if p not in set(key.tolist())]
+    key[key == -1] = unused
+    return key
+
+def key_to_mapping(key, letters=string.ascii_uppercase):
+    return {letter: chr(ord('A') + int(key[ord(letter) - ord('A')])) for letter in letters}
+
+def simulated_annealing(cipher_codes, table, start_key, seed, iterations=20000, start_temp=20.0):
+    """
+    Anneal over letter swaps scored by quadgram log-probability.
+    Worse keys are accepted with probability exp(delta / T) while T cools
+    linearly to zero, which lets the search climb out of local optima.
+    """
+    rng = np.random.default_rng(seed)
+    key = start_key.copy()
+    score = score_codes(key[cipher_codes], table)
+    best_key, best_score = key.copy(), score
+
+    swaps = rng.integers(0, 26, size=(iterations, 2))
+    thresholds = rng.random(iterations)
+    for step in range(iterations):
+        a, b = swaps[step]
+        if a == b:
+            continue
+        key[a], key[b] = key[b], key[a]
+        new_score = score_codes(key[cipher_codes], table)
+        delta = new_score - score
+        temp = start_temp * (1 - step / iterations)
+        if delta >= 0 or (temp > 0 and thresholds[step] < np.exp(delta / temp)):
+            score = new_score
+            if score > best_score:
+                best_key, best_score = key.copy(), score
+        else:
+            key[a], key[b] = key[b], key[a]
+    return best_key, best_score
+
+def start_keys(initial_mapping, restarts, rng):
+    """The frequency mapping followed by ``restarts - 1`` random keys."""
+    keys = [mapping_to_key(initial_mapping)]
+    keys += [rng.permutation(26) for _ in range(restarts - 1)]
+    return keys
+
+# Models of each pool worker, loaded once by _init_worker
+_worker_table = None
+_worker_words = None
+
+def _init_worker(quadgram_file, load_words=False):
+    global _worker_table, _worker_words
+    if quadgram_file is not None:
+        _worker_table = load_quadgrams(quadgram_file)
+    if load_words:
+        _worker_words = get_english_words()
+
+def _anneal_task(args):
+    cipher_codes, start_key, seed, iterations = args
+    return simulated_annealing(cipher_codes, _worker_table, start_key, seed, iterations)
+
+def find_best_mapping_annealing(text, initial_mapping, quadgram_file, restarts=8, iterations=20000, workers=None):
+    """
+    Run independent annealing restarts in parallel and keep the fittest key.
+    The first restart starts from the frequency mapping, the rest from random keys.
+    Returns the mapping and its fitness as average log10 probability per quadgram.
+    """
+    cipher_codes = encode_text(text)
+    rng = np.random.default_rng()
+    tasks = [(cipher_codes, key, int(rng.integers(2**32)), iterations)
+             for key in start_keys(initial_mapping, restarts, rng)]
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(quadgram_file,)) as pool:
+        results = list(pool.map(_anneal_task, tasks))
+
+    best_key, best_score = max(results, key=lambda result: result[1])
+    letters = [letter for letter in string.ascii_uppercase if letter in initial_mapping]
+    return key_to_mapping(best_key, letters), best_score / max(1, len(cipher_codes) - 3)
+
+def solve_text(encrypted_text, english_words, table=None, restarts=8, iterations=20000):
+    """
+    Solve one ciphertext in the current process with already loaded models.
+    Restarts run one after another, so a batch can parallelise across files.
+    Returns the decrypted text, quadgram fitness (None without a table) and word score.
+    """
+    initial_mapping = create_initial_mapping(get_letter_frequency(encrypted_text), get_english_frequency())
+    fitness = None
+    if table is not None:
+        cipher_codes = encode_text(encrypted_text)
+        rng = np.random.default_rng()
+        results = [simulated_annealing(cipher_codes, table, key, int(rng.integers(2**32)), iterations)
+                   for key in start_keys(initial_mapping, restarts, rng)]
+        best_key, best_score = max(results, key=lambda result: result[1])
+        best_mapping = key_to_mapping(best_key, list(initial_mapping))
+        fitness = best_score / max(1, len(cipher_codes) - 3)
+    else:
+        best_mapping, _ = find_best_mapping(encrypted_text, initial_mapping, english_words.as_set())
+    decrypted_text = decrypt_text(encrypted_text, best_mapping)
+    return decrypted_text, fitness, score_decryption(decrypted_text, english_words)
+
+def _solve_file_task(args):
+    in_path, out_path, restarts = args
+    start = time.perf_counter()
+    # A bad file becomes a failed row instead of aborting the whole batch
+    try:
+        decrypted_text, fitness, word_score = solve_text(read_text(in_path), _worker_words, _worker_table, restarts)
+        with open(out_path, 'w', encoding='utf-8') as file:
+            file.write(decrypted_text)
+    except Exception as e:
+        return os.path.basename(in_path), None, None, time.perf_counter() - start, f"{type(e).__name__}: {e}"
+    return os.path.basename(in_path), fitness, word_score, time.perf_counter() - start, None
+
+def solve_directory(directory, outdir, quadgram_file=None, restarts=8, workers=None):
+    """
+    Solve every file in ``directory`` concurrently, one file per pool task.
+    Each worker loads the lexicon and quadgram table once for the whole batch.
+    Writes <name>.solution.txt per input and returns one summary row per file,
+    with the error message of any file that could not be solved.
+    """
+    os.makedirs(outdir, exist_ok=True)
+    tasks = []
+    for name in sorted(os.listdir(directory)):
+        in_path = os.path.join(directory, name)
+        if os.path.isfile(in_path):
+            out_path = os.path.join(outdir, os.path.splitext(name)[0] + '.solution.txt')
+            tasks.append((in_path, out_path, restarts))
+
+    # Build the lexicon here if needed, so workers only ever open a complete file
+    get_english_words()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(quadgram_file, True)) as pool:
+        return list(pool.map(_solve_file_task, tasks))
+
+def save_summary(rows, filename):
+    table = tabulate(
+        [[name, '-' if fitness is None else f"{fitness:.3f}", '-' if score is None else f"{score:.2%}",
+          f"{seconds:.2f}s", error or 'ok']
+         for name, fitness, score, seconds, error in rows],
+        headers=['File', 'Quadgram fitness', 'Word score', 'Time', 'Status'],
+        tablefmt='grid'
+    )
+    with open(filename, 'w', encoding='utf-8') as file:
+        file.write(table + "\n")
+    return table
+
 def save_solution(decrypted_text, filename='solution.txt'):
     """
     Saves the decrypted text to a file.
@@ -109,9 +265,28 @@ def save_solution(decrypted_text, filename='solution.txt'):
 
 def main():
     parser = argparse.ArgumentParser(description='Automatic frequency analysis decryption (read-only)')
-    parser.add_argument('-i', '--input', required=True, help='Input file containing encrypted text (will not be modified)')
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('-i', '--input', help='Input file containing encrypted text (will not be modified)')
+    source.add_argument('-d', '--directory', help='Batch mode: solve every file in this directory')
+    parser.add_argument('-o', '--outdir', default='solutions', help='Batch mode output directory')
+    parser.add_argument('-q', '--quadgrams', default='english_quadgrams.npy', help='Quadgram table built by quadgrams.py')
+    parser.add_argument('-r', '--restarts', type=int, default=8, help='Number of annealing restarts')
+    parser.add_argument('-w', '--workers', type=int, default=None, help='Worker processes (default: all cores)')
     args = parser.parse_args()
 
+    if args.directory:
+        quadgram_file = args.quadgrams if os.path.exists(args.quadgrams) else None
+        if quadgram_file is None:
+            print(f"Quadgram table '{args.quadgrams}' not found, falling back to dictionary hill climbing.")
+        start = time.perf_counter()
+        rows = solve_directory(args.directory, args.outdir, quadgram_file, args.restarts, args.workers)
+        summary_file = os.path.join(args.outdir, 'summary.txt')
+        print(save_summary(rows, summary_file))
+        failed = sum(1 for row in rows if row[-1] is not None)
+        print(f"\nSolved {len(rows) - failed} of {len(rows)} files in {time.perf_counter() - start:.2f}s, "
+              f"summary saved to {summary_file}")
+        return
+
     # Load and process the text (read-only operation)
     encrypted_text = load_text(args.input)
     text_freq = get_letter_frequency(encrypted_text)
@@ -121,11 +296,18 @@ def main():
     # Create initial mapping
     initial_mapping = create_initial_mapping(text_freq, english_freq)
     
-    # Find best mapping
-    best_mapping, best_score = find_best_mapping(encrypted_text, initial_mapping, english_words)
+    # Find best mapping: quadgram annealing if a table is available, else dictionary hill climbing
+    fitness = None
+    if os.path.exists(args.quadgrams):
+        best_mapping, fitness = find_best_mapping_annealing(
+            encrypted_text, initial_mapping, args.quadgrams, args.restarts, workers=args.workers)
+    else:
+        print(f"Quadgram table '{args.quadgrams}' not found, falling back to dictionary hill climbing.")
+        best_mapping, _ = find_best_mapping(encrypted_text, initial_mapping, english_words.as_set())
     
     # Decrypt text with best mapping
     decrypted_text = decrypt_text(encrypted_text, best_mapping)
+    best_score = score_decryption(decrypted_text, english_words)
 
     # Prepare table data
     table_data = []
@@ -147,6 +329,8 @@ def main():
         tablefmt='grid'
     ))
     
+    if fitness is not None:
+        print(f"\nQuadgram fitness: {fitness:.3f} log10 per quadgram")
     print(f"\nDecryption quality score: {best_score:.2%}")
     print("\nDecrypted text:")
     print(decrypted_text)
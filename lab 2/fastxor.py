@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# Fast XOR primitives for the lab 2 OTP exercises
+#
+# Like zip(), every function stops at the end of the shorter input.
+
+import argparse
+import numpy as np
+
+CHUNK_SIZE = 1 << 20
+
+
+def xor_bytes(a, b):
+    """XOR two byte strings as two big integers, without per-byte objects."""
+    n = min(len(a), len(b))
+    a, b = memoryview(a)[:n], memoryview(b)[:n]
+    return (int.from_bytes(a, "big") ^ int.from_bytes(b, "big")).to_bytes(n, "big")
+
+
+def xor_into(out, a, b):
+    """
+    XOR ``a`` and ``b`` into the preallocated writable buffer ``out``.
+    Works on zero-copy uint8 views of the buffers; returns the number of bytes written.
+    """
+    n = min(len(a), len(b), len(out))
+    np.bitwise_xor(np.frombuffer(a, dtype=np.uint8, count=n),
+                   np.frombuffer(b, dtype=np.uint8, count=n),
+                   out=np.frombuffer(out, dtype=np.uint8, count=n))
+    return n
+
+
+def xor_stream(src, pad, dst, chunk_size=CHUNK_SIZE):
+    """
+    XOR two binary streams into a third, one chunk at a time.
+    Three buffers are reused for the whole stream, so memory stays constant.
+    Returns the total number of bytes written.
+    """
+    a, b, out = bytearray(chunk_size), bytearray(chunk_size), bytearray(chunk_size)
+    view = memoryview(out)
+    total = 0
+    while True:
+        n = min(src.readinto(a), pad.readinto(b))
+        if n == 0:
+            return total
+        xor_into(view[:n], a, b)
+        dst.write(view[:n])
+        total += n
+        if n < chunk_size:
+            return total
+
+
+def xor_file(infile, padfile, outfile, chunk_size=CHUNK_SIZE):
+    with open(infile, "rb") as src, open(padfile, "rb") as pad, open(outfile, "wb") as dst:
+        return xor_stream(src, pad, dst, chunk_size)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='XOR a file with a one-time pad file')
+    parser.add_argument('-i', dest='infile', required=True, help='input file')
+    parser.add_argument('-k', dest='padfile', required=True, help='pad file')
+    parser.add_argument('-o', dest='outfile', required=True, help='output file')
+    args = parser.parse_args()
+
+    n = xor_file(args.infile, args.padfile, args.outfile)
+    print(f"Wrote {n} bytes to {args.outfile}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# Precompiled English lexicon for the lab 2 substitution solver
+#
+# The nltk word list is upper-cased, sorted and written once to a binary file:
+#   magic b'LEX1' | word count (uint32) | count+1 offsets (uint32) | word blob
+# Loading memory-maps the file, so nltk is only imported when building it.
+
+import argparse
+import mmap
+import os
+import struct
+import sys
+from array import array
+from functools import lru_cache
+
+MAGIC = b'LEX1'
+LEXICON_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'english_words.lex')
+
+
+def nltk_words():
+    """Fetch the nltk word list, downloading it on first use."""
+    import nltk
+    from nltk.corpus import words
+    try:
+        nltk.data.find('corpora/words')
+    except LookupError:
+        nltk.download('words')
+    return words.words()
+
+
+def build_lexicon(filename=LEXICON_FILE, word_list=None):
+    """Serialise the sorted, de-duplicated, upper-cased word list to ``filename``."""
+    if word_list is None:
+        word_list = nltk_words()
+    encoded = sorted(set(word.upper().encode('ascii', errors='ignore') for word in word_list))
+    offsets = [0]
+    for word in encoded:
+        offsets.append(offsets[-1] + len(word))
+    # Write next to the target and rename into place, so an interrupted or
+    # concurrent build never leaves a partial file under the final name
+    tmp = f'{filename}.{os.getpid()}.tmp'
+    try:
+        with open(tmp, 'wb') as file:
+            file.write(MAGIC)
+            file.write(struct.pack(f'<I{len(offsets)}I', len(encoded), *offsets))
+            file.write(b''.join(encoded))
+        os.replace(tmp, filename)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+class Lexicon:
+    """Read-only view of a lexicon file with binary-search membership tests."""
+
+    def __init__(self, filename):
+        with open(filename, 'rb') as file:
+            if os.fstat(file.fileno()).st_size < 12:
+                raise ValueError(f"'{filename}' is too short to be a lexicon file")
+            self._data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._data[:4] != MAGIC:
+            raise ValueError(f"'{filename}' is not a lexicon file")
+        (self._count,) = struct.unpack_from('<I', self._data, 4)
+        self._blob = 8 + 4 * (self._count + 1)
+        if len(self._data) < self._blob:
+            raise ValueError(f"'{filename}' is truncated")
+        # Offsets are stored little-endian; only big-endian hosts need a swapped copy
+        self._offsets = memoryview(self._data)[8:self._blob].cast('I')
+        if sys.byteorder != 'little':
+            self._offsets = array('I', self._offsets)
+            self._offsets.byteswap()
+        if len(self._data) < self._blob + self._offsets[-1]:
+            raise ValueError(f"'{filename}' is truncated")
+        self._set = None
+
+    def __len__(self):
+        return self._count
+
+    def _word(self, i):
+        return self._data[self._blob + self._offsets[i]:self._blob + self._offsets[i + 1]]
+
+    def __contains__(self, word):
+        key = word.encode('ascii', errors='ignore') if isinstance(word, str) else word
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._word(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo < self._count and self._word(lo) == key
+
+    def __iter__(self):
+        for i in range(self._count):
+            yield self._word(i).decode('ascii')
+
+    def as_set(self):
+        """Materialise the words as a frozenset for tight scoring loops, once per lexicon."""
+        if self._set is None:
+            blob = self._data[self._blob:].decode('ascii')
+            self._set = frozenset(blob[i:j] for i, j in zip(self._offsets[:-1], self._offsets[1:]))
+        return self._set
+
+
+@lru_cache(maxsize=None)
+def load_lexicon(filename=LEXICON_FILE):
+    """Open the lexicon, building it from nltk if it is missing or unreadable."""
+    if os.path.exists(filename):
+        try:
+            return Lexicon(filename)
+        except ValueError as e:
+            print(f"{e}, rebuilding it")
+    build_lexicon(filename)
+    return Lexicon(filename)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Precompile the English lexicon used by ex1.py')
+    parser.add_argument('-o', '--output', default=LEXICON_FILE, help='Output lexicon file')
+    args = parser.parse_args()
+
+    build_lexicon(args.output)
+    print(f"Lexicon with {len(Lexicon(args.output))} words saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# Quadgram fitness model for the lab 2 substitution solver
+#
+# Build the table once from any English training text:
+#   python quadgrams.py -i corpus.txt -o english_quadgrams.npy
+# ex1.py then loads the binary table and scores candidate decryptions with it.
+
+import argparse
+import numpy as np
+
+ALPHABET_SIZE = 26
+TABLE_SIZE = ALPHABET_SIZE ** 4
+
+# Weights of each letter position inside a quadgram index
+_WEIGHTS = (ALPHABET_SIZE ** 3, ALPHABET_SIZE ** 2, ALPHABET_SIZE, 1)
+
+# Lookup table: byte value -> letter code 0..25, or 255 for anything else
+_ENCODE = np.full(256, 255, dtype=np.uint8)
+_ENCODE[np.frombuffer(b"ABCDEFGHIJKLMNOPQRSTUVWXYZ", dtype=np.uint8)] = np.arange(26)
+_ENCODE[np.frombuffer(b"abcdefghijklmnopqrstuvwxyz", dtype=np.uint8)] = np.arange(26)
+
+
+def encode_text(text):
+    """
+    Convert text to an array of letter codes (A=0 .. Z=25).
+    Non-letters are dropped so quadgrams run across word boundaries.
+    """
+    if isinstance(text, str):
+        text = text.encode("ascii", errors="ignore")
+    codes = _ENCODE[np.frombuffer(text, dtype=np.uint8)]
+    return codes[codes != 255]
+
+
+def quadgram_indices(codes):
+    """Flat indices into the 26^4 table for every quadgram in ``codes``."""
+    codes = codes.astype(np.intp, copy=False)
+    if len(codes) < 4:
+        return np.empty(0, dtype=np.intp)
+    return (codes[:-3] * _WEIGHTS[0] + codes[1:-2] * _WEIGHTS[1]
+            + codes[2:-1] * _WEIGHTS[2] + codes[3:])
+
+
+def build_quadgram_table(text, floor=0.01):
+    """
+    Count quadgrams in a training text and turn them into log10 probabilities.
+    Unseen quadgrams get log10(floor / total) so they are penalised, not fatal.
+    """
+    counts = np.bincount(quadgram_indices(encode_text(text)), minlength=TABLE_SIZE)
+    total = counts.sum()
+    if total == 0:
+        raise ValueError("Training text contains no quadgrams")
+    table = np.full(TABLE_SIZE, np.log10(floor / total), dtype=np.float32)
+    seen = counts > 0
+    table[seen] = np.log10(counts[seen] / total)
+    return table
+
+
+def save_quadgrams(table, filename):
+    np.save(filename, table.astype(np.float32, copy=False))
+
+
+def load_quadgrams(filename):
+    """Load a quadgram table, memory-mapped so loading is effectively free."""
+    table = np.load(filename, mmap_mode="r")
+    if table.shape != (TABLE_SIZE,):
+        raise ValueError(f"'{filename}' is not a 26^4 quadgram table")
+    return table
+
+
+def score_codes(codes, table):
+    """Log-probability of an encoded text: one vectorised gather and sum."""
+    return float(table[quadgram_indices(codes)].sum())
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build a quadgram fitness table from English text')
+    parser.add_argument('-i', '--input', required=True, help='Training corpus (plain English text)')
+    parser.add_argument('-o', '--output', default='english_quadgrams.npy', help='Output table file (.npy)')
+    args = parser.parse_args()
+
+    with open(args.input, 'rb') as file:
+        table = build_quadgram_table(file.read())
+    save_quadgrams(table, args.output)
+    print(f"Quadgram table saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,89 @@
 #!/usr/bin/env python3
 # ECB wrapper skeleton file for 50.042 FCS
 
-from present import *
+from present_skeleton import *
+from present_batch import present_batch, present_inv_batch
 import argparse
+import os
+import numpy as np
 
 nokeybits=80
 blocksize=64
+blockbytes=blocksize//8
+
+# Blocks read, encrypted and written per chunk; memory use is bounded by this
+chunkblocks=1<<16
+
+
+def pad(data):
+    """PKCS#7 padding to a whole number of blocks (always adds 1..8 bytes)."""
+    n=blockbytes-len(data)%blockbytes
+    return bytes(data)+bytes([n])*n
+
+
+def unpad(data):
+    n=data[-1] if data else 0
+    if not 1<=n<=blockbytes or data[-n:]!=bytes([n])*n:
+        raise ValueError("Invalid padding, wrong key or corrupted ciphertext")
+    return data[:-n]
+
+
+def readKey(keyfile):
+    """Key file holds the 80-bit key as hex text."""
+    with open(keyfile,'r') as f:
+        key=int(f.read().strip(),16)
+    if key>>nokeybits:
+        raise ValueError("Key is longer than %d bits"%nokeybits)
+    return key
+
+
+def readFull(f,view):
+    """readinto() until the buffer is full or the file ends."""
+    total=0
+    while total<len(view):
+        n=f.readinto(view[total:])
+        if not n:
+            break
+        total+=n
+    return total
 
 
 def ecb(infile,outfile,key,mode):
-    pass
+    """
+    Stream infile through PRESENT in ECB mode ('e' encrypt, 'd' decrypt).
+    Aligned chunks are read into one reusable buffer, viewed as big-endian
+    uint64 blocks without copying and encrypted as a batch; only the final
+    chunk is padded or unpadded, so memory stays constant for any file size.
+    """
+    if mode not in ('e','d'):
+        raise ValueError("mode must be 'e' or 'd'")
+    cipher=present_batch if mode=='e' else present_inv_batch
+    chunkbytes=chunkblocks*blockbytes
+    inbuf,outbuf=bytearray(chunkbytes),bytearray(chunkbytes+blockbytes)
+    inview,outview=memoryview(inbuf),memoryview(outbuf)
+
+    with open(infile,'rb') as fin, open(outfile,'wb') as fout:
+        remaining=os.fstat(fin.fileno()).st_size
+        if mode=='d' and remaining%blockbytes:
+            raise ValueError("Ciphertext length is not a multiple of the block size")
+        while True:
+            n=readFull(fin,inview)
+            remaining-=n
+            final=n<chunkbytes or remaining<=0
+            data=inview[:n]
+            if final and mode=='e':
+                data=pad(data)
+            count=len(data)//blockbytes
+            if count:
+                blocks=np.frombuffer(data,dtype='>u8',count=count)
+                np.frombuffer(outbuf,dtype='>u8',count=count)[:]=cipher(blocks,key)
+            result=outview[:count*blockbytes]
+            if final and mode=='d':
+                result=unpad(result)
+            fout.write(result)
+            if final:
+                break
+
 
 if __name__=="__main__":
     parser=argparse.ArgumentParser(description='Block cipher using ECB mode.')
@@ -17,11 +91,15 @@ if __name__=="__main__":
     parser.add_argument('-o', dest='outfile',help='output file')
     parser.add_argument('-k', dest='keyfile',help='key file')
     parser.add_argument('-m', dest='mode',help='mode')
+    parser.add_argument('-p', dest='processes',type=int,default=0,help='encrypt in parallel with this many processes')
 
     args=parser.parse_args()
     infile=args.infile
     outfile=args.outfile
     keyfile=args.keyfile
 
-
-
+    if args.processes:
+        from parallel import parallel_ecb
+        parallel_ecb(infile,outfile,readKey(keyfile),args.mode,args.processes)
+    else:
+        ecb(infile,outfile,readKey(keyfile),args.mode)
@@ -2,18 +2,132 @@
 # ECB plaintext extraction skeleton file for 50.042 FCS
 
 import argparse
+import os
+import re
+import numpy as np
+
+blockbytes=8
+
+# Blocks per streaming chunk in the multi-class extractor
+chunkblocks=1<<20
+
 
 def getInfo(headerfile):
-    pass
+    """
+    Read the known PBM header. Returns the raw header bytes, image width and
+    height, and the offset where pixel data starts in the plaintext.
+    """
+    with open(headerfile,'rb') as f:
+        header=f.read()
+    tokens=re.sub(rb'#[^\n]*',b'',header).split()
+    width,height=int(tokens[1]),int(tokens[2])
+    # The header is followed by a single whitespace before the pixel data
+    if header[-1:].isspace():
+        header=header[:-1]
+    return header,width,height,len(header)+1
+
+
+def readBlocks(infile):
+    """Memory-map the ciphertext as 8-byte records, without reading it into memory."""
+    count=os.path.getsize(infile)//blockbytes
+    return np.memmap(infile,dtype=np.uint64,mode='r',shape=(count,))
+
 
 def extract(infile,outfile,headerfile):
-    pass
+    """
+    ECB maps equal plaintext blocks to equal ciphertext blocks. Blocks of pure
+    background (all '0' pixels) are by far the most common ciphertext block, so
+    every other block is drawn as '1'. Each block covers 8 one-byte pixels.
+    """
+    header,width,height,offset=getInfo(headerfile)
+    blocks=readBlocks(infile)
+    first=offset//blockbytes
+    values,counts=np.unique(blocks[first:],return_counts=True)
+    background=values[np.argmax(counts)]
+
+    pixels=np.where(blocks[first:]==background,ord('0'),ord('1')).astype(np.uint8)
+    start=offset-first*blockbytes
+    body=np.repeat(pixels,blockbytes)[start:]
+    # Pixels sharing a block with the header are unknown; draw them as background
+    if start:
+        body[:blockbytes-start]=ord('0')
+    # Pad with background if the ciphertext ends before the image does
+    body=np.concatenate((body,np.full(max(0,width*height-len(body)),ord('0'),dtype=np.uint8)))[:width*height]
+
+    with open(outfile,'wb') as f:
+        f.write(header+b'\n')
+        f.write(body.tobytes())
+    return True
+
+
+def mgMerge(keys,counts,capacity):
+    """
+    Misra-Gries summary of (keys, counts): equal keys are summed, then the
+    (capacity+1)-th largest count is subtracted from all and non-positive
+    entries dropped. Any block seen more than N/(capacity+1) times survives.
+    """
+    keys,inverse=np.unique(keys,return_inverse=True)
+    counts=np.bincount(inverse,weights=counts).astype(np.int64)
+    if len(keys)>capacity:
+        cut=np.partition(counts,len(counts)-capacity-1)[len(counts)-capacity-1]
+        counts=counts-cut
+        keep=counts>0
+        keys,counts=keys[keep],counts[keep]
+    return keys,counts
+
+
+def heavyHitters(blocks,capacity):
+    """One streaming pass over the blocks with a bounded-memory Misra-Gries counter."""
+    keys,counts=np.empty(0,dtype=np.uint64),np.empty(0,dtype=np.int64)
+    for lo in range(0,len(blocks),chunkblocks):
+        values,chunkcounts=np.unique(blocks[lo:lo+chunkblocks],return_counts=True)
+        keys,counts=mgMerge(np.concatenate((keys,values)),np.concatenate((counts,chunkcounts)),capacity)
+    return keys,counts
+
+
+def extractClusters(infile,outfile,headerfile,k):
+    """
+    Multi-class version of extract(): the k most frequent ciphertext blocks each
+    get their own grey level, from white for the most common down to dark grey,
+    and all remaining blocks are black. Writes a binary PGM, streaming both the
+    counting pass and the drawing pass so memory stays bounded.
+    """
+    header,width,height,offset=getInfo(headerfile)
+    blocks=readBlocks(infile)
+    first=offset//blockbytes
+    keys,counts=heavyHitters(blocks[first:],max(1024,64*k))
+    top=keys[np.argsort(-counts,kind='stable')[:k]]
+    order=np.argsort(top)
+    sortedtop=top[order]
+    levels=np.append(np.linspace(255,64,len(top)).astype(np.uint8)[order],np.uint8(0))
+
+    start=offset-first*blockbytes
+    remaining=width*height
+    with open(outfile,'wb') as f:
+        f.write(b'P5\n%d %d\n255\n'%(width,height))
+        for lo in range(first,len(blocks),chunkblocks):
+            chunk=blocks[lo:lo+chunkblocks]
+            idx=np.minimum(np.searchsorted(sortedtop,chunk),len(sortedtop)-1)
+            found=sortedtop[idx]==chunk
+            pixels=np.repeat(levels[np.where(found,idx,len(levels)-1)],blockbytes)
+            if lo==first:
+                pixels=pixels[start:]
+                # Pixels sharing a block with the header are unknown; draw them as background
+                if start:
+                    pixels[:blockbytes-start]=255
+            pixels=pixels[:remaining]
+            f.write(pixels.tobytes())
+            remaining-=len(pixels)
+        # Pad with background if the ciphertext ends before the image does
+        f.write(b'\xff'*max(0,remaining))
+    return True
 
 if __name__=="__main__":
     parser=argparse.ArgumentParser(description='Extract PBM pattern.')
     parser.add_argument('-i', dest='infile',help='input file, PBM encrypted format')
     parser.add_argument('-o', dest='outfile',help='output PBM file')
     parser.add_argument('-hh', dest='headerfile',help='known header file')
+    parser.add_argument('-k', dest='clusters',type=int,default=0,help='write a PGM with one grey level for each of the K most common blocks')
 
     args=parser.parse_args()
     infile=args.infile
@@ -24,6 +138,9 @@ if __name__=="__main__":
     print('Reading header file from: %s'%headerfile)
     print('Writing to: %s'%outfile)
 
-    success=extract(infile,outfile,headerfile)
+    if args.clusters:
+        success=extractClusters(infile,outfile,headerfile,args.clusters)
+    else:
+        success=extract(infile,outfile,headerfile)
+
 
-            
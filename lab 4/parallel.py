@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# Multi-process ECB and CTR for PRESENT
+#
+# The input is read straight into a shared-memory buffer and split into
+# block-aligned shards. Workers attach to the shared input and output buffers
+# by name and encrypt their shard in place, so no block data is pickled.
+
+import argparse
+import os
+import secrets
+from multiprocessing import Pool, shared_memory
+import numpy as np
+from present_batch import present_batch, present_inv_batch
+from ecb_skeleton import blockbytes, pad, unpad, readKey, readFull
+
+# Blocks handed to one present_batch call inside a worker
+batchblocks = 1 << 16
+
+
+def ctr_counters(nonce, start, count):
+    """Counter blocks nonce || i for i in [start, start+count): 32-bit nonce, 32-bit counter."""
+    if start + count > 1 << 32:
+        raise ValueError("CTR counter overflow, message too long for one nonce")
+    return np.uint64(nonce << 32) | np.arange(start, start + count, dtype=np.uint64)
+
+
+def _shard(args):
+    inname, outname, start, stop, key, mode, nonce = args
+    shmin = shared_memory.SharedMemory(name=inname)
+    shmout = shared_memory.SharedMemory(name=outname)
+    try:
+        for lo in range(start, stop, batchblocks):
+            hi = min(stop, lo + batchblocks)
+            blocks = np.ndarray((hi - lo,), dtype='>u8', buffer=shmin.buf, offset=lo * blockbytes)
+            out = np.ndarray((hi - lo,), dtype='>u8', buffer=shmout.buf, offset=lo * blockbytes)
+            if mode == 'e':
+                out[:] = present_batch(blocks, key)
+            elif mode == 'd':
+                out[:] = present_inv_batch(blocks, key)
+            else:
+                out[:] = blocks ^ present_batch(ctr_counters(nonce, lo, hi - lo), key)
+            del blocks, out
+    finally:
+        shmin.close()
+        shmout.close()
+
+
+def _run(data_len, fill, key, mode, nonce, processes):
+    """
+    Allocate shared input/output buffers for data_len bytes (rounded up to
+    whole blocks), let fill() write the input, and process all shards in a pool.
+    Returns the output shared memory; the caller closes and unlinks it.
+    """
+    count = -(-data_len // blockbytes)
+    size = max(1, count * blockbytes)
+    shmin = shared_memory.SharedMemory(create=True, size=size)
+    shmout = shared_memory.SharedMemory(create=True, size=size)
+    try:
+        fill(shmin.buf)
+        processes = processes or os.cpu_count()
+        step = max(1, -(-count // (processes * 4)))
+        tasks = [(shmin.name, shmout.name, lo, min(count, lo + step), key, mode, nonce)
+                 for lo in range(0, count, step)]
+        with Pool(processes) as pool:
+            pool.map(_shard, tasks)
+    except BaseException:
+        shmout.close()
+        shmout.unlink()
+        raise
+    finally:
+        shmin.close()
+        shmin.unlink()
+    return shmout
+
+
+def parallel_ecb(infile, outfile, key, mode, processes=None):
+    """ECB over a process pool, with the same PKCS#7 padding as ecb()."""
+    if mode not in ('e', 'd'):
+        raise ValueError("mode must be 'e' or 'd'")
+    size = os.path.getsize(infile)
+    if mode == 'd' and size % blockbytes:
+        raise ValueError("Ciphertext length is not a multiple of the block size")
+    padded = size + blockbytes - size % blockbytes if mode == 'e' else size
+
+    def fill(buf):
+        with open(infile, 'rb') as f:
+            readFull(f, buf[:size])
+        if mode == 'e':
+            buf[size - size % blockbytes:padded] = pad(buf[size - size % blockbytes:size])
+
+    shmout = _run(padded, fill, key, mode, None, processes)
+    try:
+        body = padded - blockbytes if mode == 'd' else padded
+        # Check the padding on a copy of the last block, so no view of the
+        # shared buffer outlives an invalid-padding error and blocks close()
+        tail = unpad(bytes(shmout.buf[max(0, body):padded])) if mode == 'd' else b''
+        with open(outfile, 'wb') as f:
+            f.write(shmout.buf[:max(0, body)])
+            f.write(tail)
+    finally:
+        shmout.close()
+        shmout.unlink()
+
+
+def parallel_ctr(infile, outfile, key, mode, processes=None):
+    """
+    CTR over a process pool. Encryption picks a random 32-bit nonce and writes
+    the first counter block as an 8-byte header; no padding is needed.
+    """
+    if mode not in ('e', 'd'):
+        raise ValueError("mode must be 'e' or 'd'")
+    with open(infile, 'rb') as f:
+        if mode == 'e':
+            nonce = secrets.randbits(32)
+        else:
+            nonce = int.from_bytes(f.read(blockbytes), 'big') >> 32
+        offset = f.tell()
+    size = os.path.getsize(infile) - offset
+
+    def fill(buf):
+        with open(infile, 'rb') as f:
+            f.seek(offset)
+            readFull(f, buf[:size])
+
+    shmout = _run(size, fill, key, 'ctr', nonce, processes)
+    try:
+        with open(outfile, 'wb') as f:
+            if mode == 'e':
+                f.write((nonce << 32).to_bytes(blockbytes, 'big'))
+            f.write(shmout.buf[:size])
+    finally:
+        shmout.close()
+        shmout.unlink()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Parallel PRESENT in ECB or CTR mode.')
+    parser.add_argument('-i', dest='infile', help='input file')
+    parser.add_argument('-o', dest='outfile', help='output file')
+    parser.add_argument('-k', dest='keyfile', help='key file')
+    parser.add_argument('-m', dest='mode', help='mode, e or d')
+    parser.add_argument('-c', dest='chaining', default='ecb', choices=['ecb', 'ctr'], help='block cipher mode')
+    parser.add_argument('-p', dest='processes', type=int, default=None, help='worker processes (default: all cores)')
+
+    args = parser.parse_args()
+    run = parallel_ecb if args.chaining == 'ecb' else parallel_ctr
+    run(args.infile, args.outfile, readKey(args.keyfile), args.mode, args.processes)
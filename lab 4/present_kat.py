@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# Known-answer tests and benchmarks for PRESENT-80 and its ECB paths
+#
+#   python present_kat.py            KATs, round-trip properties, benchmarks
+#   python present_kat.py --quick    smaller property tests, no benchmarks
+
+import argparse
+import os
+import random
+import runpy
+import sys
+import tempfile
+import time
+import numpy as np
+from present_skeleton import present, present_inv, genRoundKeys
+from present_batch import present_batch, present_inv_batch
+from ecb_skeleton import ecb
+from parallel import parallel_ecb
+import modes
+
+# Appendix 1 of "PRESENT: An Ultra-Lightweight Block Cipher" (CHES 2007): (plaintext, key, ciphertext)
+VECTORS = [
+    (0x0000000000000000, 0x00000000000000000000, 0x5579C1387B228445),
+    (0x0000000000000000, 0xFFFFFFFFFFFFFFFFFFFF, 0xE72C46C0F5945049),
+    (0xFFFFFFFFFFFFFFFF, 0x00000000000000000000, 0xA112FFC72F68417B),
+    (0xFFFFFFFFFFFFFFFF, 0xFFFFFFFFFFFFFFFFFFFF, 0x3333DCD3213210D2),
+]
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def check(name, fn):
+    start = time.perf_counter()
+    try:
+        fn()
+    except AssertionError as e:
+        print("FAIL %-45s %s" % (name, e))
+        return False
+    print("ok   %-45s %6.2fs" % (name, time.perf_counter() - start))
+    return True
+
+
+def testSkeletonVectors():
+    """The bare asserts in present_skeleton's __main__, including keysTest."""
+    runpy.run_path(os.path.join(HERE, 'present_skeleton.py'), run_name='__main__')
+
+
+def testPublishedVectors():
+    for plain, key, cipher in VECTORS:
+        assert present(plain, key) == cipher, "present(%016x, %020x)" % (plain, key)
+        assert present_inv(cipher, key) == plain, "present_inv(%016x, %020x)" % (cipher, key)
+        blocks = np.array([plain], dtype=np.uint64)
+        assert int(present_batch(blocks, key)[0]) == cipher, "present_batch(%016x)" % plain
+        assert int(present_inv_batch(np.array([cipher], dtype=np.uint64), key)[0]) == plain
+
+
+def testKeySchedule(count):
+    """Each round key is the top 64 bits of the 80-bit register."""
+    for _ in range(count):
+        K = genRoundKeys(random.getrandbits(80))
+        assert len(K) == 33 and K[0] == 32
+        assert all(0 <= k < 1 << 64 for k in K[1:])
+
+
+def testScalarRoundTrip(count):
+    for _ in range(count):
+        key, plain = random.getrandbits(80), random.getrandbits(64)
+        assert present_inv(present(plain, key), key) == plain, "key %020x plain %016x" % (key, plain)
+
+
+def testBatchMatchesScalar(count):
+    rng = np.random.default_rng()
+    key = random.getrandbits(80)
+    blocks = rng.integers(0, 2**64, size=count, dtype=np.uint64)
+    cipher = present_batch(blocks, key)
+    sample = rng.choice(count, size=min(count, 500), replace=False)
+    assert all(int(cipher[i]) == present(int(blocks[i]), key) for i in sample), "batch != scalar"
+    assert np.array_equal(present_inv_batch(cipher, key), blocks), "batch round trip"
+
+
+def testEcbFiles(sizes):
+    key = random.getrandbits(80)
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = [os.path.join(tmp, name) for name in ('p', 'c', 'd')]
+        for size in sizes:
+            data = os.urandom(size)
+            with open(paths[0], 'wb') as f:
+                f.write(data)
+            ecb(paths[0], paths[1], key, 'e')
+            ecb(paths[1], paths[2], key, 'd')
+            with open(paths[2], 'rb') as f:
+                assert f.read() == data, "ECB file round trip, %d bytes" % size
+            assert os.path.getsize(paths[1]) == (size // 8 + 1) * 8
+            parallel_ecb(paths[1], paths[2], key, 'd', 2)
+            with open(paths[2], 'rb') as f:
+                assert f.read() == data, "parallel ECB decrypt, %d bytes" % size
+        # A wrong key must surface as a padding error (or, rarely, valid padding
+        # over garbage) on both paths, never as a leaked shared buffer
+        for decrypt in (ecb, lambda *args: parallel_ecb(*args, processes=2)):
+            try:
+                decrypt(paths[1], paths[2], key ^ 1, 'd')
+            except ValueError:
+                continue
+            with open(paths[2], 'rb') as f:
+                assert f.read() != data, "wrong key decrypted the file"
+
+
+def testModes(size):
+    key = random.getrandbits(80)
+    data = os.urandom(size)
+    for name in modes.MODES:
+        enc = modes.new(name, key, 'e')
+        cipher = enc.update(data[:size // 3]) + enc.update(data[size // 3:]) + enc.finalize()
+        dec = modes.new(name, key, 'd', getattr(enc, 'iv', None))
+        assert dec.update(cipher) + dec.finalize() == data, "%s round trip" % name
+
+
+def benchmark(singles=20000, batch=1 << 17, filesize=1 << 21):
+    key = random.getrandbits(80)
+    print("\npath                 | blocks/s")
+
+    start = time.perf_counter()
+    for i in range(singles):
+        present(i, key)
+    print("single-block present | %10.0f" % (singles / (time.perf_counter() - start)))
+
+    blocks = np.random.default_rng().integers(0, 2**64, size=batch, dtype=np.uint64)
+    present_batch(blocks[:1024], key)
+    start = time.perf_counter()
+    present_batch(blocks, key)
+    print("present_batch        | %10.0f" % (batch / (time.perf_counter() - start)))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        plain, cipher = os.path.join(tmp, 'p'), os.path.join(tmp, 'c')
+        with open(plain, 'wb') as f:
+            f.write(os.urandom(filesize))
+        start = time.perf_counter()
+        ecb(plain, cipher, key, 'e')
+        print("ecb() file           | %10.0f" % (filesize / 8 / (time.perf_counter() - start)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='PRESENT known-answer tests and benchmarks')
+    parser.add_argument('--quick', action='store_true', help='smaller property tests, skip benchmarks')
+    args = parser.parse_args()
+    scale = 1 if args.quick else 10
+
+    results = [
+        check('skeleton test vectors and keysTest', testSkeletonVectors),
+        check('published PRESENT-80 vectors', testPublishedVectors),
+        check('key schedule shape (%d keys)' % (100 * scale), lambda: testKeySchedule(100 * scale)),
+        check('scalar round trip (%d blocks)' % (500 * scale), lambda: testScalarRoundTrip(500 * scale)),
+        check('batch == scalar (%d blocks)' % (10000 * scale), lambda: testBatchMatchesScalar(10000 * scale)),
+        check('ECB file round trip', lambda: testEcbFiles([0, 1, 7, 8, 9, 1000, 100000 * scale])),
+        check('ECB/CBC/CTR/OFB round trip', lambda: testModes(1000 * scale + 3)),
+    ]
+    if not args.quick:
+        benchmark()
+    if not all(results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# Bit-level primitives for PRESENT: rotations with precomputed masks and
+# byte-wise table implementations of nibble S-boxes and bit permutations.
+#
+# Run this file to print per-call microbenchmarks against the naive forms.
+
+# MASK[n] == 2**n - 1, so rotations never rebuild the mask
+MASK = [(1 << n) - 1 for n in range(129)]
+MASK80 = MASK[80]
+
+
+def rol(val, r_bits, max_bits):
+    """Rotate left: 0b1001 --> 0b0011"""
+    r = r_bits % max_bits
+    mask = MASK[max_bits]
+    return ((val << r) & mask) | ((val & mask) >> (max_bits - r))
+
+
+def ror(val, r_bits, max_bits):
+    """Rotate right: 0b1001 --> 0b1100"""
+    r = r_bits % max_bits
+    mask = MASK[max_bits]
+    return ((val & mask) >> r) | ((val << (max_bits - r)) & mask)
+
+
+def rol80_61(key):
+    """The key schedule rotation of PRESENT-80, with everything constant folded."""
+    return ((key << 61) & MASK80) | (key >> 19)
+
+
+def byteSBox(table):
+    """256-entry table applying a 4-bit S-box to both nibbles of a byte."""
+    return [(table[b >> 4] << 4) | table[b & 0xF] for b in range(256)]
+
+
+def bytePermutation(permutation):
+    """
+    Eight 256-entry tables for a 64-bit permutation, where bit i moves to
+    permutation[i]. Table i holds the image of byte i, and because a bit
+    permutation is linear, the image of a state is the OR of its eight byte images.
+    """
+    tables = []
+    for i in range(8):
+        row = []
+        for b in range(256):
+            out = 0
+            for bit in range(8):
+                if (b >> bit) & 1:
+                    out |= 1 << permutation[8 * i + bit]
+            row.append(out)
+        tables.append(row)
+    return tables
+
+
+def invertPermutation(permutation):
+    inverse = [0] * len(permutation)
+    for i, p in enumerate(permutation):
+        inverse[p] = i
+    return inverse
+
+
+def bytePermute(state, tables):
+    T0, T1, T2, T3, T4, T5, T6, T7 = tables
+    return (T0[state & 0xFF] | T1[(state >> 8) & 0xFF] |
+            T2[(state >> 16) & 0xFF] | T3[(state >> 24) & 0xFF] |
+            T4[(state >> 32) & 0xFF] | T5[(state >> 40) & 0xFF] |
+            T6[(state >> 48) & 0xFF] | T7[(state >> 56) & 0xFF])
+
+
+def benchmark(number=100000):
+    """Per-call cost of each primitive next to the naive version it replaces."""
+    import random
+    import timeit
+    from present_skeleton import pmt
+
+    def naive_rol(val, r_bits, max_bits):
+        return (val << r_bits % max_bits) & (2**max_bits - 1) | \
+            ((val & (2**max_bits - 1)) >> (max_bits - (r_bits % max_bits)))
+
+    def naive_pLayer(state, permutation=pmt):
+        out = 0
+        for i in range(64):
+            out |= ((state >> i) & 1) << permutation[i]
+        return out
+
+    P = bytePermutation(pmt)
+    P_INV = bytePermutation(invertPermutation(pmt))
+    key = random.getrandbits(80)
+    state = random.getrandbits(64)
+    assert naive_rol(key, 61, 80) == rol(key, 61, 80) == rol80_61(key)
+    assert ror(rol(key, 61, 80), 61, 80) == key
+    assert naive_pLayer(state) == bytePermute(state, P)
+    assert bytePermute(bytePermute(state, P), P_INV) == state
+
+    cases = [
+        ('naive rol (2**n masks)', lambda: naive_rol(key, 61, 80)),
+        ('rol (precomputed mask)', lambda: rol(key, 61, 80)),
+        ('ror (precomputed mask)', lambda: ror(key, 61, 80)),
+        ('rol80_61', lambda: rol80_61(key)),
+        ('naive pLayer (64 bit moves)', lambda: naive_pLayer(state)),
+        ('pLayer, 8 byte tables', lambda: bytePermute(state, P)),
+        ('pLayer_inv, 8 byte tables', lambda: bytePermute(state, P_INV)),
+    ]
+    print("primitive                      | ns/call")
+    for name, fn in cases:
+        seconds = min(timeit.repeat(fn, number=number, repeat=3))
+        print("%-30s | %7.0f" % (name, seconds / number * 1e9))
+
+
+if __name__ == "__main__":
+    benchmark()
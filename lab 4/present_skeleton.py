@@ -2,6 +2,10 @@
 
 # Present skeleton file for 50.042 FCS
 
+from array import array
+from functools import lru_cache
+from present_primitives import rol, ror, rol80_61, byteSBox, bytePermutation, \
+    bytePermute, invertPermutation
 
 # constants
 FULLROUND = 31
@@ -16,61 +20,123 @@ pmt = [0, 16, 32, 48, 1, 17, 33, 49, 2, 18, 34, 50, 3, 19, 35, 51,
        8, 24, 40, 56, 9, 25, 41, 57, 10, 26, 42, 58, 11, 27, 43, 59,
        12, 28, 44, 60, 13, 29, 45, 61, 14, 30, 46, 62, 15, 31, 47, 63]
 
-# Rotate left: 0b1001 --> 0b0011
+# Rotations (rol/ror) and the table builders live in present_primitives
 
+# Table-driven layers: the state is processed one byte (two nibbles) at a time.
+# SBOX8 applies the S-box to both nibbles of a byte. PBOX[i][b] is the pLayer
+# image of byte b placed at byte position i; since a permutation is linear, the
+# pLayer of a state is the OR of its eight byte images. SP fuses both layers, so
+# a round is one XOR, eight lookups and seven ORs.
+sbox_inv = [sbox.index(x) for x in range(16)]
+pmt_inv = invertPermutation(pmt)
 
-def rol(val, r_bits, max_bits): return \
-    (val << r_bits % max_bits) & (2**max_bits - 1) | \
-    ((val & (2**max_bits - 1)) >> (max_bits - (r_bits % max_bits)))
-
-# Rotate right: 0b1001 --> 0b1100
-
-
-def ror(val, r_bits, max_bits): return \
-    ((val & (2**max_bits - 1)) >> r_bits % max_bits) | \
-    (val << (max_bits - (r_bits % max_bits)) & (2**max_bits - 1))
+SBOX8 = byteSBox(sbox)
+SBOX8_INV = byteSBox(sbox_inv)
+PBOX = bytePermutation(pmt)
+PBOX_INV = bytePermutation(pmt_inv)
+SP = [[PBOX[i][SBOX8[b]] for b in range(256)] for i in range(8)]
+# Inverse round in the pLayer_inv image of the state: pLayer_inv after sBoxLayer_inv
+ISP = [[PBOX_INV[i][SBOX8_INV[b]] for b in range(256)] for i in range(8)]
+SP0, SP1, SP2, SP3, SP4, SP5, SP6, SP7 = SP
+ISP0, ISP1, ISP2, ISP3, ISP4, ISP5, ISP6, ISP7 = ISP
 
 
 def genRoundKeys(key):
-    pass
+    """
+    PRESENT-80 key schedule. K[i] is the round key of round i (1..32), the
+    top 64 bits of the key register; K[0] holds the number of round keys.
+    """
+    K = [32]
+    for i in range(1, FULLROUND + 2):
+        K.append(key >> 16)
+        key = rol80_61(key)
+        key = (sbox[key >> 76] << 76) | (key & ((1 << 76) - 1))
+        key ^= i << 15
+    return K
 
 
 def addRoundKey(state, Ki):
-    pass
+    return state ^ Ki
 
 
 def sBoxLayer(state):
-    pass
+    out = 0
+    for i in range(0, 64, 8):
+        out |= SBOX8[(state >> i) & 0xFF] << i
+    return out
+
+
+def sBoxLayer_inv(state):
+    out = 0
+    for i in range(0, 64, 8):
+        out |= SBOX8_INV[(state >> i) & 0xFF] << i
+    return out
 
 
 def pLayer(state):
-    pass
+    return bytePermute(state, PBOX)
+
+
+def pLayer_inv(state):
+    return bytePermute(state, PBOX_INV)
 
 
 def present_round(state, roundKey):
-    return state
+    state ^= roundKey
+    return (SP0[state & 0xFF] | SP1[(state >> 8) & 0xFF] |
+            SP2[(state >> 16) & 0xFF] | SP3[(state >> 24) & 0xFF] |
+            SP4[(state >> 32) & 0xFF] | SP5[(state >> 40) & 0xFF] |
+            SP6[(state >> 48) & 0xFF] | SP7[(state >> 56) & 0xFF])
 
 
 def present_inv_round(state, roundKey):
-    return state
+    return sBoxLayer_inv(pLayer_inv(state)) ^ roundKey
+
+
+class PresentContext:
+    """
+    A PRESENT-80 key expanded once. K holds the round keys as a compact
+    array (K[0] is the count, as in genRoundKeys). KI holds pLayer_inv(K[i]),
+    which lets decrypt() run every inverse round as eight ISP lookups:
+    with u = pLayer_inv(state), an inverse round maps u to ISP(u) ^ KI[i].
+    """
+    __slots__ = ('key', 'K', 'KI')
+
+    def __init__(self, key):
+        self.key = key
+        self.K = array('Q', genRoundKeys(key))
+        self.KI = array('Q', [32] + [pLayer_inv(k) for k in self.K[1:]])
+
+    def encrypt(self, plain):
+        K = self.K
+        state = plain
+        for i in range(1, FULLROUND + 1):
+            state = present_round(state, K[i])
+        return state ^ K[32]
+
+    def decrypt(self, cipher):
+        KI = self.KI
+        u = pLayer_inv(cipher ^ self.K[32])
+        for i in range(FULLROUND, 0, -1):
+            u = (ISP0[u & 0xFF] | ISP1[(u >> 8) & 0xFF] |
+                 ISP2[(u >> 16) & 0xFF] | ISP3[(u >> 24) & 0xFF] |
+                 ISP4[(u >> 32) & 0xFF] | ISP5[(u >> 40) & 0xFF] |
+                 ISP6[(u >> 48) & 0xFF] | ISP7[u >> 56]) ^ KI[i]
+        return pLayer(u)
+
+
+@lru_cache(maxsize=128)
+def getContext(key):
+    """Expanded key for ``key``; the most recently used contexts are kept."""
+    return PresentContext(key)
 
 
 def present(plain, key):
-    K = genRoundKeys(key)
-    state = plain
-    for i in range(1, FULLROUND + 1):
-        state = present_round(state, K[i])
-    state = addRoundKey(state, K[32])
-    return state
+    return getContext(key).encrypt(plain)
 
 
 def present_inv(cipher, key):
-    K = genRoundKeys(key)
-    state = cipher
-    state = addRoundKey(state, K[32])
-    for i in range(FULLROUND, 0, -1):
-        state = present_inv_round(state, K[i])
-    return state
+    return getContext(key).decrypt(cipher)
 
 if __name__ == "__main__":
     # Testvector for key schedule
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# Field-axiom verifier for GF(2^n) addition and multiplication
+#
+# Works either on full Cayley tables (e.g. from generate_gf24_tables.py) or
+# directly on the field arithmetic, so fields up to GF(2^16) can be checked
+# without materialising 65536 x 65536 tables:
+#   python field_axioms.py -n 16 --ip 0x1100b --confidence 0.9999
+#   python field_axioms.py --table gf256.npz
+#
+# Properties over all elements or pairs are checked exhaustively when cheap.
+# Associativity and distributivity range over triples; when there are more
+# than exhaustive_limit of them, random triples are drawn instead. If a
+# fraction of at least defect_rate of all triples violated a law, the chance
+# of drawing none of them in s samples is (1 - defect_rate)^s, and s is chosen
+# so that this is at most 1 - confidence.
+
+import argparse
+import math
+import numpy as np
+from gf2n import Polynomial2
+
+# Elements (or pairs/triples) evaluated per vectorised call
+CHUNK = 1 << 20
+
+
+def fieldOps(n, ip):
+    """
+    Vectorised GF(2^n) arithmetic mod ip from first principles: carry-less
+    shift-and-XOR multiplication, then reduction from the top bit down.
+    Independent of any precomputed table, so it can check those tables.
+    """
+    modulus = ip.getInt()
+
+    def add(a, b):
+        return a ^ b
+
+    def mul(a, b):
+        product = np.zeros(np.broadcast(a, b).shape, dtype=np.int64)
+        for i in range(n):
+            product ^= np.where((b >> i) & 1, a << i, 0)
+        for bit in range(2 * n - 2, n - 1, -1):
+            product ^= np.where((product >> bit) & 1, modulus << (bit - n), 0)
+        return product
+
+    return add, mul, 1 << n
+
+
+def tableOps(addition_table, multiplication_table):
+    """Arithmetic given by two Cayley tables, as vectorised lookups."""
+    add_t = np.asarray(addition_table)
+    mul_t = np.asarray(multiplication_table)
+
+    def add(a, b):
+        return add_t[a, b].astype(np.int64)
+
+    def mul(a, b):
+        return mul_t[a, b].astype(np.int64)
+
+    return add, mul, len(add_t)
+
+
+def samplesFor(confidence, defect_rate):
+    """Random samples needed to catch a defect_rate violation with the given confidence."""
+    return math.ceil(math.log(1 - confidence) / math.log(1 - defect_rate))
+
+
+def _power(mul, a, e):
+    """a^e elementwise by square-and-multiply."""
+    result = np.ones_like(a)
+    while e:
+        if e & 1:
+            result = mul(result, a)
+        a = mul(a, a)
+        e >>= 1
+    return result
+
+
+def _chunks(total):
+    for start in range(0, total, CHUNK):
+        yield start, min(total, start + CHUNK)
+
+
+def _firstFailure(ok, *columns):
+    bad = np.flatnonzero(~ok)
+    if len(bad) == 0:
+        return None
+    return tuple(int(c[bad[0]]) for c in columns)
+
+
+def verifyAxioms(add, mul, size, confidence=0.999, defect_rate=1e-4, exhaustive_limit=1 << 24, seed=None):
+    """
+    Check the field axioms for (add, mul) on the elements 0..size-1.
+    Returns a list of (law, passed, cases checked, exhaustive, counterexample).
+    """
+    rng = np.random.default_rng(seed)
+    elements = np.arange(size, dtype=np.int64)
+    results = []
+
+    def record(law, counterexample, checked, exhaustive):
+        results.append((law, counterexample is None, checked, exhaustive, counterexample))
+
+    # Laws over single elements are always checked exhaustively
+    for law, ok in [
+        ('0 is the additive identity', (add(elements, 0) == elements) & (add(0, elements) == elements)),
+        ('1 is the multiplicative identity', (mul(elements, 1) == elements) & (mul(1, elements) == elements)),
+        ('0 * x = x * 0 = 0', (mul(elements, 0) == 0) & (mul(0, elements) == 0)),
+        # Characteristic 2: every element is its own additive inverse
+        ('additive inverses (x + x = 0)', add(elements, elements) == 0),
+    ]:
+        record(law, _firstFailure(ok, elements), size, True)
+
+    # In a field of q elements x^(q-2) is the inverse of every x != 0
+    nonzero = elements[1:]
+    inverse = _power(mul, nonzero, size - 2)
+    record('multiplicative inverses', _firstFailure(mul(nonzero, inverse) == 1, nonzero), size - 1, True)
+
+    def pairs():
+        if size * size <= exhaustive_limit:
+            for start, stop in _chunks(size * size):
+                index = np.arange(start, stop, dtype=np.int64)
+                yield index // size, index % size
+        else:
+            for start, stop in _chunks(samplesFor(confidence, defect_rate)):
+                yield rng.integers(0, size, stop - start), rng.integers(0, size, stop - start)
+
+    def triples():
+        if size ** 3 <= exhaustive_limit:
+            for start, stop in _chunks(size ** 3):
+                index = np.arange(start, stop, dtype=np.int64)
+                yield index // (size * size), (index // size) % size, index % size
+        else:
+            for start, stop in _chunks(samplesFor(confidence, defect_rate)):
+                yield tuple(rng.integers(0, size, stop - start) for _ in range(3))
+
+    pair_laws = [
+        ('closure', lambda a, b: (add(a, b) >= 0) & (add(a, b) < size) & (mul(a, b) >= 0) & (mul(a, b) < size)),
+        ('addition is commutative', lambda a, b: add(a, b) == add(b, a)),
+        ('multiplication is commutative', lambda a, b: mul(a, b) == mul(b, a)),
+    ]
+    triple_laws = [
+        ('addition is associative', lambda a, b, c: add(add(a, b), c) == add(a, add(b, c))),
+        ('multiplication is associative', lambda a, b, c: mul(mul(a, b), c) == mul(a, mul(b, c))),
+        ('multiplication distributes over addition', lambda a, b, c: mul(a, add(b, c)) == add(mul(a, b), mul(a, c))),
+    ]
+    for laws, cases, arity in ((pair_laws, pairs, 2), (triple_laws, triples, 3)):
+        exhaustive = size ** arity <= exhaustive_limit
+        for law, check in laws:
+            counterexample, checked = None, 0
+            for columns in cases():
+                counterexample = _firstFailure(check(*columns), *columns)
+                checked += len(columns[0])
+                if counterexample is not None:
+                    break
+            record(law, counterexample, checked, exhaustive)
+    return results
+
+
+def printReport(results):
+    for law, passed, checked, exhaustive, counterexample in results:
+        how = "all %d cases" % checked if exhaustive else "%d random samples" % checked
+        if passed:
+            print("✓ %s (%s)" % (law, how))
+        else:
+            print("ERROR: %s fails at %s" % (law, counterexample))
+    return all(result[1] for result in results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Verify the field axioms of GF(2^n)')
+    parser.add_argument('-n', type=int, help='field degree, with --ip')
+    parser.add_argument('--ip', help='irreducible polynomial as an int, e.g. 0x11b')
+    parser.add_argument('--table', help='.npz file with add and mul tables (generate_gf24_tables.py -f npy)')
+    parser.add_argument('--confidence', type=float, default=0.999, help='confidence for sampled laws')
+    parser.add_argument('--defect-rate', type=float, default=1e-4, help='smallest violating fraction to detect')
+    args = parser.parse_args()
+
+    if args.table:
+        tables = np.load(args.table)
+        add, mul, size = tableOps(tables['add'], tables['mul'])
+    elif args.n and args.ip:
+        add, mul, size = fieldOps(args.n, Polynomial2(int(args.ip, 0)))
+    else:
+        parser.error("give either --table or both -n and --ip")
+
+    print("Checking field axioms on %d elements, confidence %g for defects of rate %g"
+          % (size, args.confidence, args.defect_rate))
+    ok = printReport(verifyAxioms(add, mul, size, args.confidence, args.defect_rate))
+    print("\nAll field axioms hold." if ok else "\nNot a field.")
+
+
+if __name__ == "__main__":
+    main()
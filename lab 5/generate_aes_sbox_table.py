@@ -1,7 +1,15 @@
 #!/usr/bin/env python3
 # Generate AES S-box Table 4.3 and save as table2.txt (official values)
+#
+# The S-box and its inverse can also be written as importable Python, a C
+# header or raw bytes, and the generation benchmarked:
+#   python generate_aes_sbox_table.py --py aes_sbox.py --c aes_sbox.h --bin aes_sbox.bin --bench
 
-from gf2n import Polynomial2, GF2N
+import argparse
+import timeit
+from gf2n import Polynomial2, getField, polyInvmod
+
+AES_IP = 0x11b  # x^8 + x^4 + x^3 + x + 1
 
 def byte_to_bits_lsb(byte):
     # Convert integer to 8-bit vector, LSB first
@@ -11,8 +19,8 @@ def bits_to_byte_lsb(bits):
     # Convert 8-bit vector (LSB first) to integer
     return sum([bits[i] << i for i in range(8)])
 
-def aes_affine_transform(byte):
-    # Official AES affine transformation (LSB first)
+def aes_affine_transform_bits(byte):
+    # Official AES affine transformation (LSB first), one bit at a time
     # y_i = b_i ^ b_{(i+4)%8} ^ b_{(i+5)%8} ^ b_{(i+6)%8} ^ b_{(i+7)%8} ^ c_i
     c = [1,1,0,0,0,1,1,0]  # 0x63, LSB first
     b = byte_to_bits_lsb(byte)
@@ -22,17 +30,41 @@ def aes_affine_transform(byte):
         out.append(val)
     return bits_to_byte_lsb(out)
 
-def generate_aes_sbox_table(filename="table2.txt"):
-    ip = Polynomial2([1, 1, 0, 1, 1, 0, 0, 0, 1])  # AES irreducible polynomial
+def rol8(byte, r):
+    return ((byte << r) | (byte >> (8 - r))) & 0xFF
+
+def aes_affine_transform(byte):
+    # Same map on the whole byte: bit i of rol8(b, k) is b_{(i-k)%8}
+    return byte ^ rol8(byte, 1) ^ rol8(byte, 2) ^ rol8(byte, 3) ^ rol8(byte, 4) ^ 0x63
+
+def aes_affine_transform_inv(byte):
+    # Inverse affine map: b_i = y_{(i+2)%8} ^ y_{(i+5)%8} ^ y_{(i+7)%8} ^ d_i with d = 0x05
+    return rol8(byte, 1) ^ rol8(byte, 3) ^ rol8(byte, 6) ^ 0x05
+
+def generate_sboxes():
+    """AES S-box and inverse S-box as 256-entry lists, from the field's exp/log inverse table"""
+    field = getField(8, Polynomial2.fromInt(AES_IP))
+    sbox = [aes_affine_transform(field.inv(byte)) for byte in range(256)]
+    inv_sbox = [0] * 256
+    for byte, value in enumerate(sbox):
+        inv_sbox[value] = byte
+    return sbox, inv_sbox
+
+def generate_sbox_reference():
+    # The S-box element by element, independent of the field tables:
+    # extended-Euclid inverse modulo the AES polynomial and the bitwise affine map
     sbox = []
     for byte in range(256):
         if byte == 0:
             sbox_val = 0x63
         else:
-            g = GF2N(byte, 8, ip)
-            inv = g.mulInv().getInt()
-            sbox_val = aes_affine_transform(inv)
+            inv = polyInvmod(byte, AES_IP)
+            sbox_val = aes_affine_transform_bits(inv)
         sbox.append(sbox_val)
+    return sbox
+
+def generate_aes_sbox_table(filename="table2.txt"):
+    sbox, _ = generate_sboxes()
 
     # Write to file in the format of Table 4.3
     with open(filename, 'w') as f:
@@ -47,5 +79,69 @@ def generate_aes_sbox_table(filename="table2.txt"):
             f.write("\n")
     print(f"AES S-box table saved to {filename}")
 
+def _rows(table, fmt):
+    return [", ".join(fmt % v for v in table[i:i + 16]) for i in range(0, 256, 16)]
+
+def save_python(sbox, inv_sbox, filename):
+    """Module defining SBOX and INV_SBOX as tuples"""
+    with open(filename, 'w') as f:
+        f.write("# AES S-box and inverse S-box, generated by generate_aes_sbox_table.py\n")
+        for name, table in (("SBOX", sbox), ("INV_SBOX", inv_sbox)):
+            f.write(f"\n{name} = (\n")
+            for row in _rows(table, "0x%02x"):
+                f.write(f"    {row},\n")
+            f.write(")\n")
+    print(f"Python tables saved to {filename}")
+
+def save_c(sbox, inv_sbox, filename):
+    """C header with aes_sbox and aes_inv_sbox as static const uint8_t arrays"""
+    with open(filename, 'w') as f:
+        f.write("/* AES S-box and inverse S-box, generated by generate_aes_sbox_table.py */\n")
+        f.write("#include <stdint.h>\n")
+        for name, table in (("aes_sbox", sbox), ("aes_inv_sbox", inv_sbox)):
+            f.write(f"\nstatic const uint8_t {name}[256] = {{\n")
+            f.write(",\n".join(f"    {row}" for row in _rows(table, "0x%02x")))
+            f.write("\n};\n")
+    print(f"C tables saved to {filename}")
+
+def save_binary(sbox, inv_sbox, filename):
+    """512 raw bytes: the S-box followed by the inverse S-box"""
+    with open(filename, 'wb') as f:
+        f.write(bytes(sbox) + bytes(inv_sbox))
+    print(f"Binary tables saved to {filename}")
+
+def benchmark(number=20):
+    """Time per full S-box for the table-driven generator and the independent reference"""
+    sbox, inv_sbox = generate_sboxes()
+    assert sbox == generate_sbox_reference()
+    assert all(inv_sbox[sbox[b]] == b for b in range(256))
+    assert all(aes_affine_transform(b) == aes_affine_transform_bits(b) for b in range(256))
+    assert all(aes_affine_transform_inv(aes_affine_transform(b)) == b for b in range(256))
+    cases = [
+        ('ext. Euclid + bitwise affine', generate_sbox_reference),
+        ('exp/log inverse + rotations', lambda: generate_sboxes()[0]),
+    ]
+    print("\ngenerator                      | ms per S-box")
+    for name, fn in cases:
+        seconds = min(timeit.repeat(fn, number=number, repeat=3))
+        print("%-30s | %8.3f" % (name, seconds / number * 1e3))
+
 if __name__ == "__main__":
-    generate_aes_sbox_table() 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='AES S-box table generator')
+    parser.add_argument('-o', '--output', default='table2.txt', help='Table 4.3 text file')
+    parser.add_argument('--py', help='also write SBOX and INV_SBOX as a Python module')
+    parser.add_argument('--c', help='also write both tables as a C header')
+    parser.add_argument('--bin', help='also write both tables as 512 raw bytes')
+    parser.add_argument('--bench', action='store_true', help='benchmark generation time')
+    args = parser.parse_args()
+
+    generate_aes_sbox_table(args.output)
+    sbox, inv_sbox = generate_sboxes()
+    if args.py:
+        save_python(sbox, inv_sbox, args.py)
+    if args.c:
+        save_c(sbox, inv_sbox, args.c)
+    if args.bin:
+        save_binary(sbox, inv_sbox, args.bin)
+    if args.bench:
+        benchmark()
@@ -1,176 +1,206 @@
 #!/usr/bin/env python3
 # Generate addition and multiplication tables for GF(2^4)
 # Using irreducible polynomial x^4 + x^3 + 1
+#
+# Other fields up to GF(2^12) work too, e.g.
+#   python generate_gf24_tables.py -n 8 --ip 0x11b -f npy -o gf256.npz
+
+import argparse
+import numpy as np
+from gf2n import Polynomial2, getField
+from field_axioms import tableOps, verifyAxioms, printReport
+
+# Largest field whose full Cayley tables are generated
+MAX_N = 12
+
+
+def generate_tables(n, ip):
+    """
+    Full addition and multiplication tables of GF(2^n) mod ip as uint16 arrays,
+    built in one vectorised pass: addition is XOR by broadcasting and
+    multiplication is an exp[log a + log b] gather from the field's tables.
+    """
+    if n > MAX_N:
+        raise ValueError(f"Tables are limited to n <= {MAX_N}")
+    field = getField(n, ip)
+    if field.exp is None:
+        raise ValueError(f"{ip} does not define GF(2^{n})")
+
+    elements = np.arange(field.size, dtype=np.uint16)
+    addition_table = elements[:, None] ^ elements[None, :]
+
+    log = np.array(field.log, dtype=np.int32)
+    exp = np.array(field.exp, dtype=np.uint16)
+    multiplication_table = exp[log[:, None] + log[None, :]]
+    multiplication_table[0, :] = 0
+    multiplication_table[:, 0] = 0
+    return addition_table, multiplication_table
+
+
+def format_table(table):
+    """Rows of the text table format, one string per line, header included."""
+    size = len(table)
+    width = max(2, len(str(size - 1)))
+    cells = np.array([f" {v:{width}d} |" for v in range(size)])
+    lines = [" " * (width + 1) + "|" + "".join(cells.tolist())]
+    lines.append("-" * 60)
+    for i in range(size):
+        lines.append(cells[i] + "".join(cells[table[i]].tolist()))
+    return lines
 
-from gf2n import Polynomial2, GF2N
 
 def generate_gf24_tables():
     # Define the irreducible polynomial: x^4 + x^3 + 1
     ip = Polynomial2([1, 0, 0, 1, 1])  # x^4 + x^3 + 1
-    
+
     print("Generating GF(2^4) tables with irreducible polynomial:", ip)
     print("=" * 60)
-    
-    # Create all elements in GF(2^4) - 16 elements from 0 to 15
-    elements = []
-    for i in range(16):
-        g = GF2N(i, 4, ip)
-        elements.append(g)
-    
-    # Generate addition table
+
+    addition_table, multiplication_table = generate_tables(4, ip)
+
     print("\nAddition Table for GF(2^4):")
     print("-" * 60)
-    
-    # Header row
-    header = "   |"
-    for i in range(16):
-        header += f" {i:2d} |"
-    print(header)
-    print("-" * 60)
-    
-    addition_table = []
-    for i in range(16):
-        row = f" {i:2d} |"
-        row_data = []
-        for j in range(16):
-            result = elements[i].add(elements[j])
-            result_int = result.getInt()
-            row += f" {result_int:2d} |"
-            row_data.append(result_int)
-        print(row)
-        addition_table.append(row_data)
-    
-    # Generate multiplication table
+    print("\n".join(format_table(addition_table)))
+
     print("\nMultiplication Table for GF(2^4):")
     print("-" * 60)
-    
-    # Header row
-    print(header)
-    print("-" * 60)
-    
-    multiplication_table = []
-    for i in range(16):
-        row = f" {i:2d} |"
-        row_data = []
-        for j in range(16):
-            result = elements[i].mul(elements[j])
-            result_int = result.getInt()
-            row += f" {result_int:2d} |"
-            row_data.append(result_int)
-        print(row)
-        multiplication_table.append(row_data)
-    
+    print("\n".join(format_table(multiplication_table)))
+
     return addition_table, multiplication_table
 
-def save_tables_to_file(addition_table, multiplication_table, filename="table1.txt"):
+
+def save_tables_to_file(addition_table, multiplication_table, filename="table1.txt", n=4, ip=None):
     """Save the tables to a text file"""
+    if ip is None:
+        ip = Polynomial2([1, 0, 0, 1, 1])
     with open(filename, 'w') as f:
-        f.write("GF(2^4) Tables with irreducible polynomial x^4 + x^3 + 1\n")
+        f.write(f"GF(2^{n}) Tables with irreducible polynomial {ip}\n")
         f.write("=" * 60 + "\n\n")
-        
-        # Save addition table
+
         f.write("Addition Table:\n")
         f.write("-" * 60 + "\n")
-        
-        # Header
-        header = "   |"
-        for i in range(16):
-            header += f" {i:2d} |"
-        f.write(header + "\n")
-        f.write("-" * 60 + "\n")
-        
-        # Table content
-        for i in range(16):
-            row = f" {i:2d} |"
-            for j in range(16):
-                row += f" {addition_table[i][j]:2d} |"
-            f.write(row + "\n")
-        
+        f.write("\n".join(format_table(addition_table)) + "\n")
+
         f.write("\n" + "=" * 60 + "\n\n")
-        
-        # Save multiplication table
+
         f.write("Multiplication Table:\n")
         f.write("-" * 60 + "\n")
-        
-        # Header
-        f.write(header + "\n")
-        f.write("-" * 60 + "\n")
-        
-        # Table content
-        for i in range(16):
-            row = f" {i:2d} |"
-            for j in range(16):
-                row += f" {multiplication_table[i][j]:2d} |"
-            f.write(row + "\n")
-    
+        f.write("\n".join(format_table(multiplication_table)) + "\n")
+
     print(f"\nTables saved to {filename}")
 
+
+def save_tables_csv(addition_table, multiplication_table, filename):
+    """Addition then multiplication table as CSV, separated by a blank line"""
+    size = len(addition_table)
+    cells = np.array([str(v) for v in range(size)])
+    with open(filename, 'w') as f:
+        for table in (addition_table, multiplication_table):
+            for row in table:
+                f.write(",".join(cells[row].tolist()) + "\n")
+            f.write("\n")
+    print(f"\nTables saved to {filename}")
+
+
+def save_tables_npy(addition_table, multiplication_table, filename):
+    """Both tables in one .npz archive, as arrays 'add' and 'mul'"""
+    np.savez(filename, add=addition_table, mul=multiplication_table)
+    print(f"\nTables saved to {filename}")
+
+
 def verify_tables(addition_table, multiplication_table):
     """Verify some properties of the tables"""
+    add = np.asarray(addition_table)
+    mul = np.asarray(multiplication_table)
+    elements = np.arange(len(add))
+
     print("\nVerifying table properties:")
     print("-" * 30)
-    
+
     # Check addition properties
     print("Addition properties:")
-    
+
     # Identity element (0)
-    for i in range(16):
-        if addition_table[0][i] != i or addition_table[i][0] != i:
-            print(f"ERROR: 0 is not identity for addition at position {i}")
-            return False
+    bad = np.flatnonzero((add[0] != elements) | (add[:, 0] != elements))
+    if len(bad):
+        print(f"ERROR: 0 is not identity for addition at position {bad[0]}")
+        return False
     print("✓ 0 is the identity element for addition")
-    
+
     # Commutativity
-    for i in range(16):
-        for j in range(16):
-            if addition_table[i][j] != addition_table[j][i]:
-                print(f"ERROR: Addition not commutative at ({i}, {j})")
-                return False
+    bad = np.argwhere(add != add.T)
+    if len(bad):
+        print(f"ERROR: Addition not commutative at ({bad[0][0]}, {bad[0][1]})")
+        return False
     print("✓ Addition is commutative")
-    
+
     # Check multiplication properties
     print("\nMultiplication properties:")
-    
+
     # Identity element (1)
-    for i in range(16):
-        if multiplication_table[1][i] != i or multiplication_table[i][1] != i:
-            print(f"ERROR: 1 is not identity for multiplication at position {i}")
-            return False
+    bad = np.flatnonzero((mul[1] != elements) | (mul[:, 1] != elements))
+    if len(bad):
+        print(f"ERROR: 1 is not identity for multiplication at position {bad[0]}")
+        return False
     print("✓ 1 is the identity element for multiplication")
-    
+
     # Zero multiplication
-    for i in range(16):
-        if multiplication_table[0][i] != 0 or multiplication_table[i][0] != 0:
-            print(f"ERROR: 0 multiplication not working at position {i}")
-            return False
+    bad = np.flatnonzero((mul[0] != 0) | (mul[:, 0] != 0))
+    if len(bad):
+        print(f"ERROR: 0 multiplication not working at position {bad[0]}")
+        return False
     print("✓ 0 * x = x * 0 = 0 for all x")
-    
+
     # Commutativity
-    for i in range(16):
-        for j in range(16):
-            if multiplication_table[i][j] != multiplication_table[j][i]:
-                print(f"ERROR: Multiplication not commutative at ({i}, {j})")
-                return False
+    bad = np.argwhere(mul != mul.T)
+    if len(bad):
+        print(f"ERROR: Multiplication not commutative at ({bad[0][0]}, {bad[0][1]})")
+        return False
     print("✓ Multiplication is commutative")
-    
+
+    # Inverses, associativity and distributivity, sampled for large tables
+    print("\nField axioms:")
+    if not printReport(verifyAxioms(*tableOps(add, mul))):
+        return False
+
     print("\nAll table properties verified successfully!")
     return True
 
+
 def main():
-    print("GF(2^4) Table Generator")
-    print("Irreducible polynomial: x^4 + x^3 + 1")
-    print("=" * 50)
-    
-    # Generate tables
-    addition_table, multiplication_table = generate_gf24_tables()
-    
+    parser = argparse.ArgumentParser(description='Addition and multiplication tables for GF(2^n)')
+    parser.add_argument('-n', type=int, default=4, help=f'field degree, at most {MAX_N}')
+    parser.add_argument('--ip', default=None, help='irreducible polynomial as an int, e.g. 0x19')
+    parser.add_argument('-f', '--format', default='text', choices=['text', 'csv', 'npy'], help='output format')
+    parser.add_argument('-o', '--output', default='table1.txt', help='output file')
+    args = parser.parse_args()
+
+    if args.n == 4 and args.ip is None:
+        print("GF(2^4) Table Generator")
+        print("Irreducible polynomial: x^4 + x^3 + 1")
+        print("=" * 50)
+        ip = Polynomial2([1, 0, 0, 1, 1])
+        addition_table, multiplication_table = generate_gf24_tables()
+    else:
+        if args.ip is None:
+            parser.error("--ip is required for n != 4")
+        ip = Polynomial2(int(args.ip, 0))
+        print(f"GF(2^{args.n}) Table Generator")
+        print(f"Irreducible polynomial: {ip}")
+        addition_table, multiplication_table = generate_tables(args.n, ip)
+
     # Save to file
-    save_tables_to_file(addition_table, multiplication_table)
-    
+    if args.format == 'text':
+        save_tables_to_file(addition_table, multiplication_table, args.output, args.n, ip)
+    elif args.format == 'csv':
+        save_tables_csv(addition_table, multiplication_table, args.output)
+    else:
+        save_tables_npy(addition_table, multiplication_table, args.output)
+
     # Verify properties
     verify_tables(addition_table, multiplication_table)
-    
-    print(f"\nTable generation complete! Check table1.txt for the saved tables.")
+
+    print(f"\nTable generation complete! Check {args.output} for the saved tables.")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
@@ -1,282 +1,629 @@
 # 50.042 FCS Lab 5 Modular Arithmetic
 # Year 2025
 
-import copy
+from functools import lru_cache
+
+# Polynomials over GF(2) as ints: bit i is the coefficient of x^i
+
+# clmul switches from shift-and-XOR to 4-bit windows, then to Karatsuba
+# splitting, when the shorter operand reaches these sizes (in bits)
+WINDOW_MIN_BITS = 32
+KARATSUBA_MIN_BITS = 2048
+# Moduli with at most this many terms (trinomials, pentanomials) reduce by folding
+SPARSE_MAX_TERMS = 5
+
+_HEX_DIGITS = '0123456789abcdef'
+
+def _clmulSparse(a,b):
+    """Shift-and-XOR product, one shift per set bit of the sparser factor"""
+    if a.bit_count() < b.bit_count():
+        a, b = b, a
+    result = 0
+    while b:
+        low = b & -b
+        result ^= a << (low.bit_length() - 1)
+        b ^= low
+    return result
+
+def _clmulWindow(a,b):
+    """Product over the hex digits of b, each a lookup into the 16 multiples of a"""
+    a2 = a << 1
+    a3 = a2 ^ a
+    a4 = a << 2
+    a8 = a << 3
+    a12 = a8 ^ a4
+    multiples = dict(zip(_HEX_DIGITS, (0, a, a2, a3, a4, a4 ^ a, a4 ^ a2, a4 ^ a3,
+                                        a8, a8 ^ a, a8 ^ a2, a8 ^ a3, a12, a12 ^ a, a12 ^ a2, a12 ^ a3)))
+    result = 0
+    for digit in '%x' % b:
+        result = (result << 4) ^ multiples[digit]
+    return result
+
+def _clmulKaratsuba(a,b):
+    """Three half-size products: (a1 b1) x^2h + ((a0+a1)(b0+b1) - a0 b0 - a1 b1) x^h + a0 b0"""
+    h = max(a.bit_length(), b.bit_length()) // 2
+    mask = (1 << h) - 1
+    a0, a1, b0, b1 = a & mask, a >> h, b & mask, b >> h
+    low = clmul(a0, b0)
+    high = clmul(a1, b1)
+    middle = clmul(a0 ^ a1, b0 ^ b1) ^ low ^ high
+    return low ^ (middle << h) ^ (high << (2 * h))
+
+def clmul(a,b):
+    """Carry-less product of two bit polynomials"""
+    if a.bit_length() < b.bit_length():
+        a, b = b, a
+    if b.bit_length() < WINDOW_MIN_BITS or b.bit_count() < 8:
+        return _clmulSparse(a, b)
+    if b.bit_length() < KARATSUBA_MIN_BITS:
+        return _clmulWindow(a, b)
+    return _clmulKaratsuba(a, b)
+
+def polyDivmod(a,b):
+    """Quotient and remainder of bit polynomials, cancelling the leading term each step"""
+    if b == 0:
+        raise ValueError("Division by zero polynomial")
+    b_len = b.bit_length()
+    quotient = 0
+    while a.bit_length() >= b_len:
+        shift = a.bit_length() - b_len
+        quotient |= 1 << shift
+        a ^= b << shift
+    return quotient, a
+
+@lru_cache(maxsize=None)
+def _foldTerms(m):
+    """Degree and lower exponents of a sparse modulus, None if it is dense"""
+    if m < 2 or m.bit_count() > SPARSE_MAX_TERMS:
+        return None
+    n = m.bit_length() - 1
+    return n, tuple(i for i in range(n) if (m >> i) & 1)
+
+def polyMod(a,m):
+    """
+    Remainder of a modulo m. For trinomial and pentanomial moduli x^n + ...
+    everything above x^n is folded down at once, since x^n = sum of the lower
+    terms, so a few shifted XORs replace one step per bit.
+    """
+    fold = _foldTerms(m)
+    if fold is None:
+        return polyDivmod(a, m)[1]
+    n, terms = fold
+    mask = (1 << n) - 1
+    while a >> n:
+        high = a >> n
+        a &= mask
+        for i in terms:
+            a ^= high << i
+    return a
+
+def polyMulmod(a,b,m):
+    return polyMod(clmul(a, b), m)
+
+def polyPowmod(a,e,m):
+    result = 1
+    a = polyMod(a, m)
+    while e:
+        if e & 1:
+            result = polyMulmod(result, a, m)
+        a = polyMulmod(a, a, m)
+        e >>= 1
+    return polyMod(result, m)
+
+def polyInvmod(a,m):
+    """Inverse of a modulo m by the extended Euclidean algorithm, None if gcd(a, m) != 1"""
+    r1, r2 = m, polyDivmod(a, m)[1]
+    t1, t2 = 0, 1
+    while r2:
+        q, r = polyDivmod(r1, r2)
+        r1, r2 = r2, r
+        t1, t2 = t2, t1 ^ clmul(q, t2)
+    if r1 != 1:
+        return None
+    return polyDivmod(t1, m)[1]
+
+def polyGcd(a,b):
+    while b:
+        a, b = b, polyDivmod(a, b)[1]
+    return a
+
+def polyIsIrreducible(m):
+    """
+    Rabin's test: m of degree n is irreducible iff x^(2^n) = x mod m and
+    gcd(x^(2^(n/q)) - x, m) = 1 for every prime q dividing n.
+    """
+    n = m.bit_length() - 1
+    if n < 1:
+        return False
+    if n == 1:
+        return True
+    if not m & 1:
+        return False  # divisible by x
+    checkpoints = {n // q for q in _primeFactors(n)}
+    h = 2  # x
+    for k in range(1, n + 1):
+        h = polyMulmod(h, h, m)
+        if k in checkpoints and polyGcd(m, h ^ 2) != 1:
+            return False
+    return h == 2
+
+def polyIsPrimitive(m):
+    """Irreducible, with x of multiplicative order 2^n - 1 modulo m"""
+    if not (m & 1 and polyIsIrreducible(m)):
+        return False
+    order = (1 << (m.bit_length() - 1)) - 1
+    return all(polyPowmod(2, order // q, m) != 1 for q in _primeFactors(order))
+
 class Polynomial2:
     def __init__(self,coeffs):
-        # Store coefficients as a list, where index i represents coefficient of x^i
-        # Remove trailing zeros to normalize the polynomial
-        self.coeffs = coeffs[:]  # Make a copy to avoid modifying the input
-        self._normalize()
-    
-    def _normalize(self):
-        """Remove trailing zeros to normalize the polynomial"""
-        while len(self.coeffs) > 1 and self.coeffs[-1] == 0:
-            self.coeffs.pop()
-    
+        # Coefficients are stored as the bits of one int: bit i is the coefficient of x^i.
+        # A list (index i = coefficient of x^i) or an int may be passed in.
+        if isinstance(coeffs, int):
+            self.value = coeffs
+        else:
+            value = 0
+            for i, c in enumerate(coeffs):
+                if c:
+                    value |= 1 << i
+            self.value = value
+
+    @classmethod
+    def fromInt(cls,value):
+        """Build a polynomial directly from its bit representation"""
+        p = cls.__new__(cls)
+        p.value = value
+        return p
+
+    @property
+    def coeffs(self):
+        """Coefficient list, index i is the coefficient of x^i (trailing zeros removed)"""
+        v = self.value
+        if v == 0:
+            return [0]
+        return [(v >> i) & 1 for i in range(v.bit_length())]
+
     def degree(self):
         """Return the degree of the polynomial"""
-        return len(self.coeffs) - 1
-    
+        return max(self.value.bit_length() - 1, 0)
+
     def add(self,p2):
         # Polynomial addition in GF(2) is XOR operation
-        max_len = max(len(self.coeffs), len(p2.coeffs))
-        result = []
-        for i in range(max_len):
-            a = self.coeffs[i] if i < len(self.coeffs) else 0
-            b = p2.coeffs[i] if i < len(p2.coeffs) else 0
-            result.append(a ^ b)  # XOR in GF(2)
-        return Polynomial2(result)
+        return Polynomial2.fromInt(self.value ^ p2.value)
 
     def sub(self,p2):
         return self.add(p2)
 
     def mul(self,p2,modp=None):
+        # Carry-less multiplication, see clmul for the methods by size
+        result = clmul(self.value, p2.value)
         if modp is None:
-            result_len = len(self.coeffs) + len(p2.coeffs) - 1
-            result = [0] * result_len
-            
-            for i in range(len(self.coeffs)):
-                for j in range(len(p2.coeffs)):
-                    if self.coeffs[i] == 1 and p2.coeffs[j] == 1:
-                        result[i + j] ^= 1  # XOR in GF(2)
-            
-            return Polynomial2(result)
-        else:
-            temp_result = self.mul(p2)
-            return temp_result.div(modp)[1]
+            return Polynomial2.fromInt(result)
+        return Polynomial2.fromInt(polyMod(result, modp.value))
 
     def div(self,p2):
-        if len(p2.coeffs) == 1 and p2.coeffs[0] == 0:
-            raise ValueError("Division by zero polynomial")
-        
-        dividend = self.coeffs[:]
-        divisor = p2.coeffs[:]
-        divisor_degree = len(divisor) - 1
-        
-        quotient = [0] * max(1, len(dividend) - divisor_degree)
-        remainder = dividend[:]
-        
-        for i in range(len(dividend) - divisor_degree, -1, -1):
-            if i + divisor_degree < len(remainder) and remainder[i + divisor_degree] == 1:
-                quotient[i] = 1
-                for j in range(len(divisor)):
-                    if i + j < len(remainder):
-                        remainder[i + j] ^= divisor[j]
-        
-        return Polynomial2(quotient), Polynomial2(remainder)
+        quotient, remainder = polyDivmod(self.value, p2.value)
+        return Polynomial2.fromInt(quotient), Polynomial2.fromInt(remainder)
 
     def __str__(self):
-        if len(self.coeffs) == 1 and self.coeffs[0] == 0:
+        if self.value == 0:
             return "0"
-        
+
         terms = []
-        for i in range(len(self.coeffs)):
-            if self.coeffs[i] == 1:
+        for i in range(self.value.bit_length()):
+            if (self.value >> i) & 1:
                 if i == 0:
                     terms.append("1")
                 elif i == 1:
                     terms.append("x")
                 else:
                     terms.append(f"x^{i}")
-        
-        if not terms:
-            return "0"
-        
+
         return " + ".join(reversed(terms))
 
     def getInt(self):
-        result = 0
-        for i, coeff in enumerate(self.coeffs):
-            if coeff == 1:
-                result |= (1 << i)
-        return result
+        return self.value
 
     @staticmethod
     def getIntStatic(p):
         return p.getInt()
 
+    def isIrreducible(self):
+        return polyIsIrreducible(self.value)
 
-class GF2N:
-    affinemat=[[1,0,0,0,1,1,1,1],
-               [1,1,0,0,0,1,1,1],
-               [1,1,1,0,0,0,1,1],
-               [1,1,1,1,0,0,0,1],
-               [1,1,1,1,1,0,0,0],
-               [0,1,1,1,1,1,0,0],
-               [0,0,1,1,1,1,1,0],
-               [0,0,0,1,1,1,1,1]]
-
-    def __init__(self,x,n=8,ip=Polynomial2([1,1,0,1,1,0,0,0,1])):
+    def isPrimitive(self):
+        return polyIsPrimitive(self.value)
+
+
+def irreduciblePolynomials(n):
+    """Every irreducible polynomial of degree n, in increasing order"""
+    for m in range(1 << n, 1 << (n + 1)):
+        # Above degree 1, rule out the factors x (no constant term) and x + 1 (even weight) first
+        if n > 1 and (not m & 1 or m.bit_count() % 2 == 0):
+            continue
+        if polyIsIrreducible(m):
+            yield Polynomial2.fromInt(m)
+
+def primitivePolynomials(n):
+    """Every primitive polynomial of degree n, in increasing order"""
+    for p in irreduciblePolynomials(n):
+        if polyIsPrimitive(p.value):
+            yield p
+
+
+# Fields up to this size get exp/log tables and interned (flyweight) elements
+TABLE_MAX_N = 16
+FLYWEIGHT_MAX_N = 16
+
+def _primeFactors(m):
+    factors = []
+    p = 2
+    while p * p <= m:
+        if m % p == 0:
+            factors.append(p)
+            while m % p == 0:
+                m //= p
+        p += 1
+    if m > 1:
+        factors.append(m)
+    return factors
+
+class GF2NField:
+    """
+    Arithmetic context for GF(2^n) modulo the polynomial ip, on int elements.
+    For n <= TABLE_MAX_N it finds a generator g and builds exp/log tables once,
+    so mul, div and inv are table lookups: a*b = g^(log a + log b).
+    Otherwise (or if ip is not irreducible) it falls back to polynomial arithmetic.
+    Use getField() to share one context per (n, ip).
+    """
+    def __init__(self,n,ip):
         self.n = n
         self.ip = ip
-        
+        self.modulus = ip.getInt()
+        self.size = 1 << n
+        self.generator = None
+        self.exp = None
+        self.log = None
+        self._elements = [None] * self.size if n <= FLYWEIGHT_MAX_N else None
+        if n <= TABLE_MAX_N and ip.degree() == n:
+            self._buildTables()
+
+    def element(self,value):
+        """The GF2N element for an int already reduced to n bits, interned in small fields"""
+        if self._elements is None:
+            return GF2N._make(value, self)
+        e = self._elements[value]
+        if e is None:
+            e = self._elements[value] = GF2N._make(value, self)
+        return e
+
+    def _findGenerator(self):
+        """Smallest element of multiplicative order 2^n - 1, or None if ip gives no field"""
+        order = self.size - 1
+        cofactors = [order // p for p in _primeFactors(order)]
+        for g in range(2, self.size):
+            if polyPowmod(g, order, self.modulus) != 1:
+                return None  # Fermat fails, so Z2[x]/ip is not a field
+            if all(polyPowmod(g, c, self.modulus) != 1 for c in cofactors):
+                return g
+        return 1 if order == 1 else None
+
+    def _buildTables(self):
+        g = self._findGenerator()
+        if g is None:
+            return
+        order = self.size - 1
+        # exp is doubled so exp[log a + log b] never needs a modulo
+        exp = [0] * (2 * order)
+        log = [0] * self.size
+        x = 1
+        for i in range(order):
+            exp[i] = exp[i + order] = x
+            log[x] = i
+            x = polyMulmod(x, g, self.modulus)
+        self.generator, self.exp, self.log = g, exp, log
+
+    def mul(self,a,b):
+        if self.exp is None:
+            return polyMulmod(a, b, self.modulus)
+        if a == 0 or b == 0:
+            return 0
+        return self.exp[self.log[a] + self.log[b]]
+
+    def inv(self,a):
+        """Multiplicative inverse; 0 maps to 0, as in GF2N.mulInv"""
+        if a == 0:
+            return 0
+        if self.exp is None:
+            result = polyInvmod(a, self.modulus)
+            if result is None:
+                raise ValueError("Multiplicative inverse does not exist")
+            return result
+        return self.exp[(self.size - 1 - self.log[a]) % (self.size - 1)]
+
+    def div(self,a,b):
+        """Field division a * b^-1"""
+        if b == 0:
+            raise ZeroDivisionError("Division by zero in GF(2^%d)" % self.n)
+        if a == 0:
+            return 0
+        if self.exp is None:
+            return self.mul(a, self.inv(b))
+        return self.exp[self.log[a] + (self.size - 1 - self.log[b])]
+
+@lru_cache(maxsize=None)
+def _fieldFor(n,modulus):
+    return GF2NField(n, Polynomial2.fromInt(modulus))
+
+def getField(n,ip):
+    """Shared GF2NField for GF(2^n) modulo ip, built once per (n, ip)"""
+    return _fieldFor(n, ip.getInt())
+
+class AffineMap:
+    """
+    Affine map y = Mx + c over GF(2), compiled to one bitmask per row of M so
+    that output bit i is the parity of x & mask_i. matrix[i][j] is 1 when output
+    bit i depends on input bit j. Bits count from the LSB, or from the MSB with
+    msbFirst; constant is an int or a bit list in the same order.
+    """
+    def __init__(self,matrix,constant=0,msbFirst=False):
+        self.inBits = len(matrix[0])
+        self.outBits = len(matrix)
+        def position(i,width):
+            return width - 1 - i if msbFirst else i
+        self.rows = [(position(i, self.outBits),
+                      sum(bit << position(j, self.inBits) for j, bit in enumerate(row)))
+                     for i, row in enumerate(matrix)]
+        if isinstance(constant, list):
+            constant = sum(bit << position(i, self.outBits) for i, bit in enumerate(constant))
+        self.constant = constant
+        self._lookup = None
+
+    def __call__(self,x):
+        y = self.constant
+        for shift, mask in self.rows:
+            y ^= ((x & mask).bit_count() & 1) << shift
+        return y
+
+    def table(self):
+        """Images of all 2^inBits inputs, for inputs of at most TABLE_MAX_N bits"""
+        if self.inBits > TABLE_MAX_N:
+            raise ValueError("Lookup tables are limited to %d input bits" % TABLE_MAX_N)
+        return [self(x) for x in range(1 << self.inBits)]
+
+    def batch(self,values):
+        """Map a numpy array of inputs at once, as a gather from the compiled table"""
+        import numpy as np
+        if self._lookup is None:
+            dtype = np.uint8 if self.outBits <= 8 else np.uint16 if self.outBits <= 16 else np.uint32
+            self._lookup = np.array(self.table(), dtype=dtype)
+        return self._lookup[np.asarray(values) & ((1 << self.inBits) - 1)]
+
+class _lazyClassAttribute:
+    """Class attribute computed on first access, then stored on the class itself"""
+    def __init__(self,build):
+        self.build = build
+        self.name = build.__name__
+
+    def __get__(self,obj,owner):
+        value = self.build()
+        setattr(owner, self.name, value)
+        return value
+
+@lru_cache(maxsize=None)
+def defaultIP():
+    """AES modulus x^8 + x^4 + x^3 + x + 1, the default ip of GF2N"""
+    return Polynomial2([1,1,0,1,1,0,0,0,1])
+
+class GF2N:
+    """
+    Immutable element of GF(2^n): the element as an int plus its shared
+    GF2NField. In fields with n <= FLYWEIGHT_MAX_N every value has exactly one
+    instance, so arithmetic returns cached objects instead of allocating.
+    """
+    __slots__ = ('value', 'field')
+
+    @_lazyClassAttribute
+    def affinemat():
+        return [[1,0,0,0,1,1,1,1],
+                [1,1,0,0,0,1,1,1],
+                [1,1,1,0,0,0,1,1],
+                [1,1,1,1,0,0,0,1],
+                [1,1,1,1,1,0,0,0],
+                [0,1,1,1,1,1,0,0],
+                [0,0,1,1,1,1,1,0],
+                [0,0,0,1,1,1,1,1]]
+
+    def __new__(cls,x,n=8,ip=None):
+        if ip is None:
+            ip = defaultIP()
+        field = getField(n, ip)
         if isinstance(x, int):
-            coeffs = []
-            for i in range(n):
-                coeffs.append((x >> i) & 1)
-            self.p = Polynomial2(coeffs)
+            value = x
+        elif isinstance(x, Polynomial2):
+            value = x.value
         else:
-            if isinstance(x, Polynomial2):
-                coeffs = x.coeffs[:n]
-                while len(coeffs) < n:
-                    coeffs.append(0)
-                self.p = Polynomial2(coeffs)
-            else:
-                raise ValueError("x must be an integer or Polynomial2")
+            raise ValueError("x must be an integer or Polynomial2")
+        # Only the low n coefficients are kept
+        return field.element(value & (field.size - 1))
+
+    @classmethod
+    def _make(cls,value,field):
+        e = object.__new__(cls)
+        object.__setattr__(e, 'value', value)
+        object.__setattr__(e, 'field', field)
+        return e
+
+    def __setattr__(self,name,value):
+        raise AttributeError("GF2N elements are immutable")
+
+    def __reduce__(self):
+        # copy, deepcopy and pickle rebuild through the constructor, which
+        # returns the interned element of the same field
+        return (GF2N, (self.value, self.n, self.ip))
+
+    def __eq__(self,other):
+        return isinstance(other, GF2N) and self.value == other.value and self.field is other.field
+
+    def __hash__(self):
+        return hash((self.value, self.field.n, self.field.modulus))
+
+    @property
+    def n(self):
+        return self.field.n
+
+    @property
+    def ip(self):
+        return self.field.ip
+
+    @property
+    def p(self):
+        return Polynomial2.fromInt(self.value)
 
     def add(self,g2):
-        result_poly = self.p.add(g2.p)
-        result_coeffs = result_poly.coeffs[:self.n]
-        while len(result_coeffs) < self.n:
-            result_coeffs.append(0)
-        return GF2N(Polynomial2(result_coeffs), self.n, self.ip)
+        return self.field.element(self.value ^ g2.value)
 
     def sub(self,g2):
         return self.add(g2)
-    
+
     def mul(self,g2):
-        result_poly = self.p.mul(g2.p, self.ip)
-        return GF2N(result_poly, self.n, self.ip)
+        field = self.field
+        return field.element(field.mul(self.value, g2.value) & (field.size - 1))
 
     def div(self,g2):
-        q, r = self.p.div(g2.p)
-        return GF2N(q, self.n, self.ip), GF2N(r, self.n, self.ip)
+        q, r = polyDivmod(self.value, g2.value)
+        mask = self.field.size - 1
+        return self.field.element(q & mask), self.field.element(r & mask)
 
     def getPolynomial2(self):
         return self.p
 
     def __str__(self):
-        return str(self.getInt())
+        return str(self.value)
 
     def getInt(self):
-        return self.p.getInt()
+        return self.value
 
     def mulInv(self):
-        
-        if self.p.coeffs == [0]:
-            return GF2N(0, self.n, self.ip)
-        r1 = self.ip
-        r2 = self.p
-        t1 = Polynomial2([0])
-        t2 = Polynomial2([1])
-        
-        while r2.coeffs != [0]:
-            q, r = r1.div(r2)
-            r_new = r1.add(q.mul(r2))
-            r1 = r2
-            r2 = r_new
-            t_new = t1.add(q.mul(t2))
-            t1 = t2
-            t2 = t_new
-        
-        if r1.coeffs == [1]:
-            result_coeffs = t1.coeffs[:self.n]
-            while len(result_coeffs) < self.n:
-                result_coeffs.append(0)
-            return GF2N(Polynomial2(result_coeffs), self.n, self.ip)
-        else:
-            raise ValueError("Multiplicative inverse does not exist")
+        field = self.field
+        return field.element(field.inv(self.value) & (field.size - 1))
+
+    @_lazyClassAttribute
+    def _affine():
+        # affinemat and the constant 0x63 with the MSB of the element as bit 0
+        return AffineMap(GF2N.affinemat, [1,1,0,0,0,1,1,0], msbFirst=True)
 
     def affineMap(self):
-        input_val = self.getInt()
-        vector = [0] * 8
-        for i in range(8):
-            vector[7-i] = (input_val >> i) & 1  # MSB first
-        
-        result = [0] * 8
-        b = [1, 1, 0, 0, 0, 1, 1, 0]  # 0x63 in binary (MSB first)
-        
-        for i in range(8):
-            sum_val = 0
-            for j in range(8):
-                sum_val ^= (self.affinemat[i][j] & vector[j])
-            result[i] = sum_val ^ b[i]
-        
-        result_val = 0
-        for i in range(8):
-            result_val |= (result[7-i] << i)
-        
-        return GF2N(result_val, self.n, self.ip)
-
-print('\nTest 1')
-print('======')
-print('p1=x^5+x^2+x')
-print('p2=x^3+x^2+1')
-p1=Polynomial2([0,1,1,0,0,1])
-p2=Polynomial2([1,0,1,1])
-p3=p1.add(p2)
-print('p3= p1+p2 = ',p3)
-
-print('\nTest 2')
-print('======')
-print('p4=x^7+x^4+x^3+x^2+x')
-print('modp=x^8+x^7+x^5+x^4+1')
-p4=Polynomial2([0,1,1,1,1,0,0,1])
-# modp=Polynomial2([1,1,0,1,1,0,0,0,1])
-modp=Polynomial2([1,0,0,0,1,1,0,1,1])
-p5=p1.mul(p4,modp)
-print('p5=p1*p4 mod (modp)=',p5)
-
-print('\nTest 3')
-print('======')
-print('p6=x^12+x^7+x^2')
-print('p7=x^8+x^4+x^3+x+1')
-p6=Polynomial2([0,0,1,0,0,0,0,1,0,0,0,0,1])    
-p7=Polynomial2([1,1,0,1,1,0,0,0,1])
-p8q,p8r=p6.div(p7)
-print('q for p6/p7=',p8q)
-print('r for p6/p7=',p8r)
-
-####
-print('\nTest 4')
-print('======')
-g1=GF2N(100)
-g2=GF2N(5)
-print('g1 = ',g1.getPolynomial2())
-print('g2 = ',g2.getPolynomial2())
-g3=g1.add(g2)
-print('g1+g2 = ',g3)
-
-print('\nTest 5')
-print('======')
-ip=Polynomial2([1,1,0,0,1])
-print('irreducible polynomial',ip)
-g4=GF2N(0b1101,4,ip)
-g5=GF2N(0b110,4,ip)
-print('g4 = ',g4.getPolynomial2())
-print('g5 = ',g5.getPolynomial2())
-g6=g4.mul(g5)
-print('g4 x g5 = ',g6.p)
-
-print('\nTest 6')
-print('======')
-# Create a default irreducible polynomial for 13-bit field
-ip_13 = Polynomial2([1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1])  # x^13 + 1
-g7=GF2N(0b1000010000100,13,ip_13)
-g8=GF2N(0b100011011,13,ip_13)
-print('g7 = ',g7.getPolynomial2())
-print('g8 = ',g8.getPolynomial2())
-q,r=g7.div(g8)
-print('g7/g8 =')
-print('q = ',q.getPolynomial2())
-print('r = ',r.getPolynomial2())
-
-print('\nTest 7')
-print('======')
-ip=Polynomial2([1,1,0,0,1])
-print('irreducible polynomial',ip)
-g9=GF2N(0b101,4,ip)
-print('g9 = ',g9.getPolynomial2())
-print('inverse of g9 =',g9.mulInv().getPolynomial2())
-
-print('\nTest 8')
-print('======')
-ip=Polynomial2([1,1,0,1,1,0,0,0,1])
-print('irreducible polynomial',ip)
-g10=GF2N(0xc2,8,ip)
-print('g10 = 0xc2')
-g11=g10.mulInv()
-print('inverse of g10 = g11 =', hex(g11.getInt()))
-g12=g11.affineMap()
-print('affine map of g11 =',hex(g12.getInt()))
+        return GF2N(self._affine(self.value), self.n, self.ip)
+
+def runTests():
+    """Lab demos; run with python gf2n.py (importing the module runs nothing)"""
+    print('\nTest 1')
+    print('======')
+    print('p1=x^5+x^2+x')
+    print('p2=x^3+x^2+1')
+    p1=Polynomial2([0,1,1,0,0,1])
+    p2=Polynomial2([1,0,1,1])
+    p3=p1.add(p2)
+    print('p3= p1+p2 = ',p3)
+
+    print('\nTest 2')
+    print('======')
+    print('p4=x^7+x^4+x^3+x^2+x')
+    print('modp=x^8+x^7+x^5+x^4+1')
+    p4=Polynomial2([0,1,1,1,1,0,0,1])
+    # modp=Polynomial2([1,1,0,1,1,0,0,0,1])
+    modp=Polynomial2([1,0,0,0,1,1,0,1,1])
+    p5=p1.mul(p4,modp)
+    print('p5=p1*p4 mod (modp)=',p5)
+
+    print('\nTest 3')
+    print('======')
+    print('p6=x^12+x^7+x^2')
+    print('p7=x^8+x^4+x^3+x+1')
+    p6=Polynomial2([0,0,1,0,0,0,0,1,0,0,0,0,1])    
+    p7=Polynomial2([1,1,0,1,1,0,0,0,1])
+    p8q,p8r=p6.div(p7)
+    print('q for p6/p7=',p8q)
+    print('r for p6/p7=',p8r)
+
+    ####
+    print('\nTest 4')
+    print('======')
+    g1=GF2N(100)
+    g2=GF2N(5)
+    print('g1 = ',g1.getPolynomial2())
+    print('g2 = ',g2.getPolynomial2())
+    g3=g1.add(g2)
+    print('g1+g2 = ',g3)
+
+    print('\nTest 5')
+    print('======')
+    ip=Polynomial2([1,1,0,0,1])
+    print('irreducible polynomial',ip)
+    g4=GF2N(0b1101,4,ip)
+    g5=GF2N(0b110,4,ip)
+    print('g4 = ',g4.getPolynomial2())
+    print('g5 = ',g5.getPolynomial2())
+    g6=g4.mul(g5)
+    print('g4 x g5 = ',g6.p)
+
+    print('\nTest 6')
+    print('======')
+    # Create a default irreducible polynomial for 13-bit field
+    ip_13 = Polynomial2([1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1])  # x^13 + 1
+    g7=GF2N(0b1000010000100,13,ip_13)
+    g8=GF2N(0b100011011,13,ip_13)
+    print('g7 = ',g7.getPolynomial2())
+    print('g8 = ',g8.getPolynomial2())
+    print('x^13+1 is irreducible:',ip_13.isIrreducible())
+    q,r=g7.div(g8)
+    print('g7/g8 =')
+    print('q = ',q.getPolynomial2())
+    print('r = ',r.getPolynomial2())
+
+    print('\nTest 7')
+    print('======')
+    ip=Polynomial2([1,1,0,0,1])
+    print('irreducible polynomial',ip)
+    g9=GF2N(0b101,4,ip)
+    print('g9 = ',g9.getPolynomial2())
+    print('inverse of g9 =',g9.mulInv().getPolynomial2())
+
+    print('\nTest 8')
+    print('======')
+    ip=Polynomial2([1,1,0,1,1,0,0,0,1])
+    print('irreducible polynomial',ip)
+    g10=GF2N(0xc2,8,ip)
+    print('g10 = 0xc2')
+    g11=g10.mulInv()
+    print('inverse of g10 = g11 =', hex(g11.getInt()))
+    g12=g11.affineMap()
+    print('affine map of g11 =',hex(g12.getInt()))
+
+def benchmark():
+    """Multiply and reduce times across degrees: bit by bit next to the fast paths"""
+    import random
+    import timeit
+    # NIST binary-curve moduli (FIPS 186-4 D.1.2), then plain products without one
+    cases = [(163, (1<<163)|(1<<7)|(1<<6)|(1<<3)|1), (233, (1<<233)|(1<<74)|1),
+             (283, (1<<283)|(1<<12)|(1<<7)|(1<<5)|1), (409, (1<<409)|(1<<87)|1),
+             (571, (1<<571)|(1<<10)|(1<<5)|(1<<2)|1), (1024, None), (4096, None), (16384, None)]
+    print("degree | shift-XOR mul | clmul    | divmod   | polyMod  (us/call)")
+    for n, m in cases:
+        a, b = random.getrandbits(n), random.getrandbits(n)
+        number = max(5, 20000 // n)
+        def time(fn):
+            return min(timeit.repeat(fn, number=number, repeat=3)) / number * 1e6
+        row = "%6d | %13.1f | %8.1f" % (n, time(lambda: _clmulSparse(a, b)), time(lambda: clmul(a, b)))
+        if m is not None:
+            product = clmul(a, b)
+            row += " | %8.1f | %8.1f" % (time(lambda: polyDivmod(product, m)), time(lambda: polyMod(product, m)))
+        print(row)
+
+
+if __name__ == "__main__":
+    import sys
+    if '--bench' in sys.argv:
+        benchmark()
+    else:
+        runTests()